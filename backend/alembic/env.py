@@ -0,0 +1,53 @@
+"""
+Alembic migration environment
+"""
+from logging.config import fileConfig
+import os
+
+from sqlalchemy import create_engine, pool
+from alembic import context
+from dotenv import load_dotenv
+
+from app.database import Base
+from app import models  # noqa: F401 - registers the models on Base.metadata
+
+# Load environment variables
+load_dotenv()
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting to the database"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against the configured database"""
+    connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
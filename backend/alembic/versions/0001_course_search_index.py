@@ -0,0 +1,49 @@
+"""Full-text search index on courses
+
+Revision ID: 0001_course_search_index
+Revises:
+Create Date: 2026-10-17 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_course_search_index"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay identical to app.models.search_document so the planner can use the index
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Full-text search is PostgreSQL only
+    if bind.dialect.name != "postgresql":
+        return
+    # Fresh databases get the index from create_all along with the table
+    if not context.is_offline_mode() and not sa.inspect(bind).has_table("courses"):
+        return
+
+    # Build without blocking writes on an existing catalog
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_courses_search_vector "
+            f"ON courses USING gin (({SEARCH_DOCUMENT}))"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_courses_search_vector")
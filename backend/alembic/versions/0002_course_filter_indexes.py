@@ -0,0 +1,56 @@
+"""Composite indexes for course filter and sort combinations
+
+Revision ID: 0002_course_filter_indexes
+Revises: 0001_course_search_index
+Create Date: 2026-10-17 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_course_filter_indexes"
+down_revision: Union[str, None] = "0001_course_search_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with Course.__table_args__ (0003 adds ix_courses_rating_id)
+# The id tiebreaker lets the rating and credits indexes deliver the full ORDER BY
+INDEXES = {
+    "ix_courses_category_level_created_at": ["category", "level", "created_at"],
+    "ix_courses_category_created_at": ["category", "created_at"],
+    "ix_courses_published_created_at": ["published", "created_at"],
+    "ix_courses_published_rating_id": ["published", "rating", "id"],
+    "ix_courses_duration": ["duration"],
+    "ix_courses_credits_id": ["credits", "id"],
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Fresh databases get the indexes from create_all along with the table
+    if not context.is_offline_mode() and not sa.inspect(bind).has_table("courses"):
+        return
+
+    if bind.dialect.name == "postgresql":
+        # Build without blocking writes on an existing catalog
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES.items():
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON courses ({', '.join(columns)})")
+    else:
+        for name, columns in INDEXES.items():
+            op.create_index(name, "courses", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name in INDEXES:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    else:
+        for name in INDEXES:
+            op.drop_index(name, table_name="courses", if_exists=True)
@@ -0,0 +1,50 @@
+"""Index the unfiltered rating sort with its id tiebreaker
+
+Revision ID: 0003_course_sort_indexes
+Revises: 0002_course_filter_indexes
+Create Date: 2026-10-17 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_course_sort_indexes"
+down_revision: Union[str, None] = "0002_course_filter_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with Course.__table_args__
+INDEXES = {
+    "ix_courses_rating_id": ["rating", "id"],
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Fresh databases get the indexes from create_all along with the table
+    if not context.is_offline_mode() and not sa.inspect(bind).has_table("courses"):
+        return
+
+    if bind.dialect.name == "postgresql":
+        # Build without blocking writes on an existing catalog
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES.items():
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON courses ({', '.join(columns)})")
+    else:
+        for name, columns in INDEXES.items():
+            op.create_index(name, "courses", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name in INDEXES:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    else:
+        for name in INDEXES:
+            op.drop_index(name, table_name="courses", if_exists=True)
@@ -0,0 +1,59 @@
+"""Course facet summary table, maintained by the course write paths
+
+Revision ID: 0004_course_facet_counts
+Revises: 0003_course_sort_indexes
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_course_facet_counts"
+down_revision: Union[str, None] = "0003_course_sort_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Bucket labels as of this revision (crud.RATING_BUCKETS / DURATION_BUCKETS)
+RATING_BUCKET = (
+    "CASE WHEN rating < 1 THEN '0-1' WHEN rating < 2 THEN '1-2' WHEN rating < 3 THEN '2-3' "
+    "WHEN rating < 4 THEN '3-4' ELSE '4-5' END"
+)
+DURATION_BUCKET = (
+    "CASE WHEN duration < 5 THEN '0-5' WHEN duration < 10 THEN '5-10' WHEN duration < 20 THEN '10-20' "
+    "WHEN duration < 40 THEN '20-40' WHEN duration < 80 THEN '40-80' ELSE '80+' END"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Fresh databases get the table from create_all along with courses
+    if not context.is_offline_mode() and not sa.inspect(bind).has_table("courses"):
+        return
+
+    if context.is_offline_mode() or not sa.inspect(bind).has_table("course_facet_counts"):
+        op.create_table(
+            "course_facet_counts",
+            sa.Column("category", sa.String(), primary_key=True),
+            sa.Column("level", sa.String(), primary_key=True),
+            sa.Column("published", sa.Boolean(), primary_key=True),
+            sa.Column("rating_bucket", sa.String(), primary_key=True),
+            sa.Column("duration_bucket", sa.String(), primary_key=True),
+            sa.Column("count", sa.Integer(), nullable=False),
+        )
+
+    # The app may have created the table empty at startup; recount either way
+    op.execute("DELETE FROM course_facet_counts")
+    op.execute(
+        "INSERT INTO course_facet_counts "
+        "(category, level, published, rating_bucket, duration_bucket, count) "
+        f"SELECT category, level, COALESCE(published, false), {RATING_BUCKET}, {DURATION_BUCKET}, COUNT(*) "
+        "FROM courses GROUP BY 1, 2, 3, 4, 5"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("course_facet_counts")
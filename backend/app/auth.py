@@ -1,16 +1,20 @@
 """
 Authentication utilities: JWT tokens, password hashing
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Callable, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
+from app.cache import TTLCache
 from app.database import get_db
 from app.models import User
 from app.schemas import TokenData
@@ -24,20 +28,118 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes below BCRYPT_ROUNDS are flagged for update and rehashed on next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS
+)
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Authenticated principal caches.
+# Verified tokens are cached until their own expiry; user rows for USER_CACHE_TTL
+# seconds, invalidated explicitly when the user is updated.
+token_cache = TTLCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", 4096)), ttl=None)
+user_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", 1024)),
+    ttl=float(os.getenv("USER_CACHE_TTL", 60))
+)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification in a dedicated, bounded worker pool.
+    At most `workers` hashes run at once; once `max_pending` calls are queued or
+    running, new calls are rejected with 503 instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _timed(self, submitted_at: float, func: Callable, *args) -> Any:
+        waited = time.perf_counter() - submitted_at
+        with self._lock:
+            self._active += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def run(self, func: Callable, *args) -> Any:
+        """Run func(*args) on the hashing pool and wait for the result"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        with self._lock:
+            self._pending += 1
+        try:
+            return self._executor.submit(self._timed, time.perf_counter(), func, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        """Snapshot of pool saturation and queueing"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_total / self._completed * 1000, 2) if self._completed else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 2),
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))),
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses outdated settings, return a fresh hash.
+    Returns (verified, new_hash) where new_hash is None when no rehash is needed.
+    """
+    return password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return password_hasher.run(pwd_context.hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -54,22 +156,46 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[TokenData]:
-    """Decode and verify a JWT token"""
+    """Decode and verify a JWT token (signature checks are cached per token)"""
+    cached = token_cache.get(token)
+    if cached is not None:
+        token_data, expires_at = cached
+        if expires_at is None or expires_at > time.time():
+            return token_data
+        token_cache.pop(token)
+        return None
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             return None
-        return TokenData(username=username)
+        token_data = TokenData(username=username)
     except JWTError:
         return None
 
+    token_cache.set(token, (token_data, payload.get("exp")))
+    return token_data
+
 
-async def get_current_user(
+def _user_snapshot(user: User) -> dict:
+    """Copy a user's column values for the user cache"""
+    return {column.key: getattr(user, column.key) for column in User.__table__.columns}
+
+
+def invalidate_cached_user(username: str) -> None:
+    """Drop a user from the principal cache after it changes"""
+    user_cache.pop(username)
+
+
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
-    """Get the current authenticated user from JWT token"""
+    """
+    Get the current authenticated user from JWT token.
+    Declared sync so FastAPI resolves it in the threadpool, off the event loop.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -80,10 +206,18 @@ async def get_current_user(
     if token_data is None or token_data.username is None:
         raise credentials_exception
     
+    snapshot = user_cache.get(token_data.username)
+    if snapshot is not None:
+        # Rebuild a per-request instance and attach it without a SELECT
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    
     user = db.query(User).filter(User.username == token_data.username).first()
     if user is None:
         raise credentials_exception
     
+    user_cache.set(user.username, _user_snapshot(user))
     return user
 
 
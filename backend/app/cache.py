@@ -0,0 +1,232 @@
+"""
+In-process caching utilities
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+import hashlib
+import os
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL (seconds).
+    ttl=None keeps entries until they are evicted; ttl <= 0 disables the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by clear(), so a value computed before a clear can be recognised as stale
+        self.generation = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    @property
+    def enabled(self) -> bool:
+        return (self.ttl is None or self.ttl > 0) and self.maxsize > 0
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+        With `generation` (read before the value was computed), the value is
+        dropped if the cache was cleared in the meantime.
+        """
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop a single entry if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MemoryBackend:
+    """In-process response cache backend (per worker)"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 30.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, generation: Optional[int] = None) -> None:
+        self._cache.set(key, value, generation)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def generation(self) -> int:
+        return self._cache.generation
+
+
+class RedisBackend:
+    """
+    Shared response cache backend so every worker sees the same entries and invalidations.
+    Values are tagged with the generation they were stored under; clear() only
+    bumps the generation, which turns every older value into a miss, and the TTL
+    expires them. Redis errors are treated as misses (and no-op writes), so an
+    outage degrades to uncached responses instead of failing requests.
+    """
+
+    def __init__(self, url: str, namespace: str, ttl: Optional[float] = 30.0):
+        import redis  # optional dependency, only needed when RESPONSE_CACHE_URL is set
+
+        self._client = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+        self._prefix = f"{namespace}:"
+        self._generation_key = f"{namespace}#generation"
+        self._ttl_ms = None if ttl is None else int(ttl * 1000)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            # One round trip for the value and the current generation
+            current, raw = self._client.mget(self._generation_key, self._prefix + key)
+        except self._errors as e:
+            print(f"Warning: response cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        generation, value = raw.split(b"\n", 1)
+        return value if int(generation) == int(current or 0) else None
+
+    def set(self, key: str, value: bytes, generation: Optional[int] = None) -> None:
+        if self._ttl_ms is not None and self._ttl_ms <= 0:
+            return
+        if generation is None:
+            generation = self.generation()
+            if generation is None:
+                return
+        try:
+            self._client.set(self._prefix + key, f"{generation}\n".encode() + value, px=self._ttl_ms)
+        except self._errors as e:
+            print(f"Warning: response cache write failed: {e}")
+
+    def clear(self) -> None:
+        try:
+            self._client.incr(self._generation_key)
+        except self._errors as e:
+            # Runs after the database commit, so never fail the request; the TTL bounds staleness
+            print(f"Warning: response cache invalidation failed: {e}")
+
+    def generation(self) -> Optional[int]:
+        """The current generation, or None while Redis is unreachable (set() then skips storing)"""
+        try:
+            return int(self._client.get(self._generation_key) or 0)
+        except self._errors as e:
+            print(f"Warning: response cache read failed: {e}")
+            return None
+
+
+class CachedResponse(NamedTuple):
+    """A serialized response body with its validators"""
+    body: bytes
+    etag: str
+    last_modified: Optional[str] = None
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag derived from the response bytes"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def version_etag(*parts: Any) -> str:
+    """
+    ETag derived from what a body is built from (ids, updated_at, request
+    parameters) rather than from its bytes, so a conditional request can be
+    answered before anything is serialized
+    """
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+class ResponseCache:
+    """
+    Cache of pre-serialized JSON response bodies.
+    A hit is returned as-is, skipping both the database and Pydantic.
+    Entries carry their ETag (and optionally Last-Modified), so conditional
+    requests can be answered from the cache too.
+    The backend only needs get/set/clear of bytes plus a generation counter
+    that clear() bumps, so tests can pass their own.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from normalized request parameters"""
+        return "|".join("" if part is None else str(part) for part in parts)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self.backend.get(key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        header, body = raw.split(b"\n", 1)
+        etag, last_modified = header.decode().split("\t")
+        return CachedResponse(body, etag, last_modified or None)
+
+    def generation(self) -> int:
+        """Read before querying the database and pass to set(), so a body read before a write is not cached after it"""
+        return self.backend.generation()
+
+    def set(self, key: str, body: bytes, last_modified: Optional[str] = None,
+            generation: Optional[int] = None, etag: Optional[str] = None) -> CachedResponse:
+        """Store a body and return it with its validators (the ETag is computed from the body unless given)"""
+        entry = CachedResponse(body, etag or compute_etag(body), last_modified)
+        header = f"{entry.etag}\t{last_modified or ''}\n".encode()
+        self.backend.set(key, header + body, generation)
+        return entry
+
+    def invalidate(self) -> None:
+        """Drop every cached response, e.g. after a write"""
+        self.backend.clear()
+
+
+def build_response_cache(namespace: str) -> ResponseCache:
+    """
+    Create a response cache from the environment.
+    Uses Redis when RESPONSE_CACHE_URL is set, otherwise an in-process LRU.
+    """
+    ttl = float(os.getenv("RESPONSE_CACHE_TTL", 30))
+    url = os.getenv("RESPONSE_CACHE_URL")
+    if url:
+        try:
+            return ResponseCache(RedisBackend(url, namespace, ttl=ttl))
+        except ImportError:
+            print("Warning: RESPONSE_CACHE_URL is set but redis is not installed; using in-process cache")
+    return ResponseCache(MemoryBackend(maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", 1024)), ttl=ttl))
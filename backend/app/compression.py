@@ -0,0 +1,142 @@
+"""
+Response compression middleware
+
+Compresses complete (non-streaming) responses with brotli when the client
+accepts it and the brotli package is installed, otherwise gzip. Responses below
+COMPRESSION_MIN_SIZE, already-encoded responses (precompressed static assets)
+and content types that do not compress (images) are passed through untouched.
+Every compressible response carries `Vary: Accept-Encoding`, compressed or not,
+so shared caches never hand an uncompressed copy to a client that accepts gzip
+(or the reverse).
+"""
+from typing import Optional
+import gzip
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+# Low brotli qualities compress about as fast as gzip -6 and still beat it on size
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+# Content types worth compressing (PNG/JPEG/WebP are already compressed)
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/javascript", "application/x-ndjson",
+    "application/xml", "image/svg+xml",
+)
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def accepted_encodings(headers: Headers) -> set:
+    """Content codings the client accepts (q=0 excluded)"""
+    accepted = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        token, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token and quality > 0:
+            accepted.add(token.lower())
+    return accepted
+
+
+def choose_encoding(headers: Headers) -> Optional[str]:
+    accepted = accepted_encodings(headers)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def varies_by_encoding(headers: Headers) -> bool:
+    """Whether this middleware may send a different encoding of the response to other clients"""
+    return "content-encoding" not in headers and is_compressible(headers.get("content-type"))
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware, so streaming responses (exports) pass through
+    without being buffered.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope))
+        if encoding is None:
+            async def send_uncompressed(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(raw=message["headers"])
+                    if varies_by_encoding(headers):
+                        headers.add_vary_header("Accept-Encoding")
+                await send(message)
+
+            await self.app(scope, receive, send_uncompressed)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows whether it is complete
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type"))
+                or len(body) < self.minimum_size
+            ):
+                passthrough = True
+                if varies_by_encoding(headers):
+                    headers.add_vary_header("Accept-Encoding")
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers and not headers["etag"].startswith("W/"):
+                # The encoded bytes differ, so only a weak validator still holds
+                headers["ETag"] = "W/" + headers["etag"]
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,14 +1,43 @@
 """
 CRUD operations for database models
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import Optional, List
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from sqlalchemy import or_, and_, text, func, insert, update, delete, select, case, tuple_
+from collections import Counter
+from typing import Optional, List, Any, Iterable
 from datetime import datetime
+import base64
+import json
+import os
+import uuid
 
-from app.models import User, Course
-from app.schemas import UserCreate, CourseCreate, CourseUpdate
-from app.auth import get_password_hash
+from app.models import User, Course, CourseFacetCount, SEARCH_CONFIG, search_document
+from app.schemas import UserCreate, CourseCreate, CourseUpdate, CourseBulkUpdate, CourseFilter
+from app.auth import get_password_hash, invalidate_cached_user
+from app.cache import TTLCache, build_response_cache
+
+# Cached listing totals, keyed on the normalized filter tuple.
+# Cleared on every course write; the TTL bounds staleness across workers.
+COURSE_COUNT_CACHE_TTL = float(os.getenv("COURSE_COUNT_CACHE_TTL", 30))
+course_count_cache = TTLCache(
+    maxsize=int(os.getenv("COURSE_COUNT_CACHE_SIZE", 512)),
+    ttl=COURSE_COUNT_CACHE_TTL
+)
+
+# Serialized GET /api/courses and /api/courses/{id} bodies
+course_response_cache = build_response_cache("courses")
+
+# The course_facet_counts rows, read once per TTL per worker; cleared on local writes
+facet_summary_cache = TTLCache(maxsize=1, ttl=float(os.getenv("FACET_SUMMARY_TTL", 30)))
+
+
+def invalidate_course_caches() -> None:
+    """Drop cached course counts, responses and facet summary rows after a course write"""
+    course_count_cache.clear()
+    course_response_cache.invalidate()
+    facet_summary_cache.clear()
 
 
 # User CRUD operations
@@ -45,54 +74,231 @@ def update_user(db: Session, user: User, update_data: dict) -> User:
     
     user.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_cached_user(user.username)
+    # Single-course responses embed the creator
+    course_response_cache.invalidate()
     db.refresh(user)
     return user
 
 
+def update_user_password_hash(db: Session, user: User, hashed_password: str) -> User:
+    """Replace a user's password hash (e.g. after an automatic rehash on login)"""
+    user.hashed_password = hashed_password
+    db.commit()
+    invalidate_cached_user(user.username)
+    return user
+
+
 # Course CRUD operations
-def get_courses(
+VALID_SORT_FIELDS = ["title", "created_at", "updated_at", "duration", "level", "rating", "credits"]
+DATETIME_SORT_FIELDS = {"created_at", "updated_at"}
+RELEVANCE_SORT = "relevance"
+DEFAULT_SORT = "created_at"
+
+
+def resolve_sort_field(sort_by: str) -> str:
+    """Map an unknown sort_by to the default so every listing has a deterministic order"""
+    if sort_by in VALID_SORT_FIELDS or sort_by == RELEVANCE_SORT:
+        return sort_by
+    return DEFAULT_SORT
+
+
+def _load_columns(query, columns: Optional[Iterable[str]], *required: Optional[str]):
+    """
+    Restrict a Course query to the given columns (plus any required for sorting or joins).
+    With columns=None every column is loaded as usual.
+    """
+    if columns is None:
+        return query
+    names = set(columns) | {name for name in required if name}
+    return query.options(load_only(*(getattr(Course, name) for name in names)))
+
+
+def _listing_query(
     db: Session,
-    skip: int = 0,
-    limit: int = 100,
-    category: Optional[str] = None,
-    level: Optional[str] = None,
-    published: Optional[bool] = None,
-    search: Optional[str] = None,
-    sort_by: str = "created_at",
-    order: str = "desc"
-) -> tuple[List[Course], int]:
-    """Get courses with filtering, sorting, and pagination"""
+    columns: Optional[Iterable[str]],
+    with_creator: bool,
+    as_rows: bool,
+    *required: Optional[str]
+):
+    """
+    Base query for the course listings.
+    With as_rows the query yields plain Row tuples of the selected columns, skipping
+    ORM object construction and the identity map; creators cannot be loaded that way.
+    """
+    if as_rows:
+        names = {name for name in required if name}
+        names |= set(columns) if columns is not None else set(Course.__table__.columns.keys())
+        return db.query(*(column for column in Course.__table__.columns if column.key in names))
     query = db.query(Course)
-    
-    # Apply filters
+    if with_creator:
+        query = query.options(selectinload(Course.creator))
+    return _load_columns(query, columns, *required, "created_by" if with_creator else None)
+
+
+def _full_text_enabled(db: Session) -> bool:
+    """Full-text search (and its GIN index) is only available on PostgreSQL"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _search_query(search: str):
+    """Parse a user search string into a tsquery"""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, search)
+
+
+# Range filters: CourseFilter field -> (column, comparison)
+RANGE_FILTERS = {
+    "min_rating": (Course.rating, "ge"),
+    "max_rating": (Course.rating, "le"),
+    "min_duration": (Course.duration, "ge"),
+    "max_duration": (Course.duration, "le"),
+    "min_credits": (Course.credits, "ge"),
+    "max_credits": (Course.credits, "le"),
+}
+
+
+def _course_filters(course_filter: Optional[CourseFilter] = None, full_text: bool = False) -> list:
+    """
+    Build the filter clauses shared by the course listing queries.
+    With full_text, search matches against the indexed tsvector document;
+    otherwise it falls back to ILIKE on title and description.
+    """
     filters = []
+    if course_filter is None:
+        return filters
+    category, level, published, search = (
+        course_filter.category, course_filter.level, course_filter.published, course_filter.search
+    )
     if category:
         filters.append(Course.category == category)
     if level:
-        filters.append(Course.level == level)
+        filters.append(Course.level == getattr(level, "value", level))
     if published is not None:
         filters.append(Course.published == published)
-    if search:
+    for field, (column, comparison) in RANGE_FILTERS.items():
+        bound = getattr(course_filter, field)
+        if bound is not None:
+            filters.append(column >= bound if comparison == "ge" else column <= bound)
+    if search and full_text:
+        document = search_document(Course.title, Course.description)
+        filters.append(document.op("@@")(_search_query(search)))
+    elif search:
         search_filter = or_(
             Course.title.ilike(f"%{search}%"),
             Course.description.ilike(f"%{search}%")
         )
         filters.append(search_filter)
+    return filters
+
+
+def filter_cache_key(course_filter: Optional[CourseFilter]) -> tuple:
+    """Normalize the listing filters into a hashable cache key"""
+    if course_filter is None:
+        return ()
+    values = course_filter.model_dump(mode="json")
+    search = values.get("search")
+    values["search"] = search.strip() if search else None
+    return tuple((field, value if value != "" else None) for field, value in sorted(values.items()))
+
+
+def has_filters(course_filter: Optional[CourseFilter], fields: Optional[Iterable[str]] = None) -> bool:
+    """Whether any filter (or any of `fields`) is set; published=False is a filter too"""
+    return any(
+        value is not None
+        for field, value in filter_cache_key(course_filter)
+        if fields is None or field in fields
+    )
+
+
+def _has_range_filters(course_filter: Optional[CourseFilter]) -> bool:
+    return has_filters(course_filter, RANGE_FILTERS)
+
+
+def encode_cursor(course: Course, sort_by: str, order: str) -> str:
+    """Encode the keyset position of a course as an opaque cursor"""
+    value: Any = getattr(course, sort_by)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"s": sort_by, "o": order.lower(), "v": value, "id": course.id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> tuple[Any, str]:
+    """
+    Decode a cursor into its (sort value, course id) keyset position.
+    Raises ValueError if the cursor is malformed or was issued for another ordering.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        cursor_sort, cursor_order = payload["s"], payload["o"]
+        value, course_id = payload["v"], payload["id"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+
+    if cursor_sort != sort_by or cursor_order != order.lower():
+        raise ValueError("Cursor does not match the requested sort order")
+
+    if sort_by in DATETIME_SORT_FIELDS and value is not None:
+        value = datetime.fromisoformat(value)
+    return value, course_id
+
+
+def _course_ordering(sort_by: str, order: str, search: Optional[str], full_text: bool) -> list:
+    """ORDER BY clauses for a listing sort (id breaks ties so page boundaries are stable)"""
+    if sort_by == RELEVANCE_SORT:
+        if search and full_text:
+            rank = func.ts_rank_cd(search_document(Course.title, Course.description), _search_query(search))
+            return [rank.desc(), Course.id.asc()]
+        return [Course.created_at.desc(), Course.id.desc()]
+    sort_column = getattr(Course, resolve_sort_field(sort_by))
+    if order.lower() == "desc":
+        return [sort_column.desc(), Course.id.desc()]
+    return [sort_column.asc(), Course.id.asc()]
+
+
+def get_courses(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[CourseFilter] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    include_total: bool = True,
+    with_creator: bool = False,
+    columns: Optional[Iterable[str]] = None,
+    as_rows: bool = False
+) -> tuple[List[Any], Optional[int]]:
+    """
+    Get courses with filtering, sorting, and pagination.
+    The total is served from the count cache and skipped when include_total is False.
+    sort_by="relevance" ranks full-text search matches (PostgreSQL only);
+    without a search it falls back to the newest courses first.
+    with_creator loads every creator on the page in one batched query.
+    columns limits the SELECT to those columns (the sort column is always loaded for cursors).
+    as_rows returns Row tuples instead of Course objects.
+    """
+    sort_column = resolve_sort_field(sort_by)
+    query = _listing_query(
+        db, columns, with_creator, as_rows,
+        sort_column if sort_column in VALID_SORT_FIELDS else None
+    )
+    full_text = _full_text_enabled(db)
     
-    if filters:
-        query = query.filter(and_(*filters))
+    # Apply filters
+    clauses = _course_filters(filters, full_text)
+    if clauses:
+        query = query.filter(and_(*clauses))
     
     # Get total count
-    total_count = query.count()
+    total_count = None
+    if include_total:
+        total_count = count_courses(db, filters)
     
     # Apply sorting
-    valid_sort_fields = ["title", "created_at", "updated_at", "duration", "level"]
-    if sort_by in valid_sort_fields:
-        sort_column = getattr(Course, sort_by)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
+    search = filters.search if filters else None
+    query = query.order_by(*_course_ordering(sort_by, order, search, full_text))
     
     # Apply pagination
     courses = query.offset(skip).limit(limit).all()
@@ -100,9 +306,322 @@ def get_courses(
     return courses, total_count
 
 
-def get_course_by_id(db: Session, course_id: str) -> Optional[Course]:
-    """Get a single course by ID"""
-    return db.query(Course).filter(Course.id == course_id).first()
+def count_courses(db: Session, filters: Optional[CourseFilter] = None) -> int:
+    """Count the courses matching the listing filters (cached)"""
+    key = filter_cache_key(filters)
+    total = course_count_cache.get(key)
+    if total is not None:
+        return total
+
+    generation = course_count_cache.generation
+    query = db.query(Course)
+    clauses = _course_filters(filters, _full_text_enabled(db))
+    if clauses:
+        query = query.filter(and_(*clauses))
+    total = query.count()
+    course_count_cache.set(key, total, generation)
+    return total
+
+
+def estimate_course_count(db: Session) -> Optional[int]:
+    """
+    Estimate the total number of courses from the planner statistics.
+    Only available on PostgreSQL; returns None when no estimate exists.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = db.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": Course.__tablename__}
+    ).scalar()
+    # reltuples is -1 until the table has been vacuumed/analyzed
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def get_courses_after(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    filters: Optional[CourseFilter] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    with_creator: bool = False,
+    columns: Optional[Iterable[str]] = None,
+    as_rows: bool = False
+) -> tuple[List[Any], Optional[str]]:
+    """
+    Get courses with keyset (cursor) pagination.
+    Seeks past the cursor position on (sort column, id) instead of using OFFSET,
+    so every page costs the same regardless of depth.
+    Returns the page and the cursor for the next page (None on the last page).
+    """
+    if sort_by not in VALID_SORT_FIELDS:
+        sort_by = DEFAULT_SORT
+    descending = order.lower() == "desc"
+    sort_column = getattr(Course, sort_by)
+
+    query = _listing_query(db, columns, with_creator, as_rows, sort_by)
+
+    clauses = _course_filters(filters, _full_text_enabled(db))
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, order)
+        # Row-value comparison lets the (sort column, id) index seek straight to the position
+        position = tuple_(sort_column, Course.id)
+        if descending:
+            clauses.append(position < tuple_(value, last_id))
+        else:
+            clauses.append(position > tuple_(value, last_id))
+    if clauses:
+        query = query.filter(and_(*clauses))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), Course.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Course.id.asc())
+
+    # Fetch one extra row to find out whether another page exists
+    courses = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(courses) > limit:
+        courses = courses[:limit]
+        next_cursor = encode_cursor(courses[-1], sort_by, order)
+
+    return courses, next_cursor
+
+
+# Facets
+# Histogram buckets as [lower, upper) bounds; None means open-ended
+RATING_BUCKETS = [(0, 1), (1, 2), (2, 3), (3, 4), (4, None)]
+DURATION_BUCKETS = [(0, 5), (5, 10), (10, 20), (20, 40), (40, 80), (80, None)]
+
+
+def _bucket_label(lower: float, upper: Optional[float], closed_top: Optional[float] = None) -> str:
+    if upper is None:
+        return f"{lower}-{closed_top}" if closed_top is not None else f"{lower}+"
+    return f"{lower}-{upper}"
+
+
+RATING_LABELS = [_bucket_label(lower, upper, closed_top=5) for lower, upper in RATING_BUCKETS]
+DURATION_LABELS = [_bucket_label(lower, upper) for lower, upper in DURATION_BUCKETS]
+
+
+def _bucket_expression(column, buckets: list, labels: List[str]):
+    """CASE expression mapping a numeric column to its histogram bucket label"""
+    whens = [(column < upper, label) for (_, upper), label in zip(buckets, labels) if upper is not None]
+    return case(*whens, else_=labels[-1])
+
+
+def _facet_rows(db: Session, filters: Optional[CourseFilter] = None) -> List[tuple]:
+    """
+    Count courses per (category, level, published, rating bucket, duration bucket)
+    in one grouped query, optionally restricted by search and range filters
+    """
+    rating_bucket = _bucket_expression(Course.rating, RATING_BUCKETS, RATING_LABELS)
+    duration_bucket = _bucket_expression(Course.duration, DURATION_BUCKETS, DURATION_LABELS)
+    statement = select(
+        Course.category, Course.level, Course.published, rating_bucket, duration_bucket, func.count()
+    ).group_by(Course.category, Course.level, Course.published, rating_bucket, duration_bucket)
+    # Facet dimensions are filtered afterwards, per facet
+    if filters is not None:
+        filters = filters.model_copy(update={"category": None, "level": None, "published": None})
+    clauses = _course_filters(filters, _full_text_enabled(db))
+    if clauses:
+        statement = statement.where(and_(*clauses))
+    return [tuple(row) for row in db.execute(statement)]
+
+
+def _bucket(value: float, buckets: list, labels: List[str]) -> str:
+    """Python twin of _bucket_expression, for rows that were just written"""
+    for (_, upper), label in zip(buckets, labels):
+        if upper is not None and value < upper:
+            return label
+    return labels[-1]
+
+
+def facet_key(category: str, level: str, published: Optional[bool], rating: float, duration: float) -> tuple:
+    """The course_facet_counts row a course is counted in"""
+    return (
+        category, getattr(level, "value", level), bool(published),
+        _bucket(rating, RATING_BUCKETS, RATING_LABELS),
+        _bucket(duration, DURATION_BUCKETS, DURATION_LABELS),
+    )
+
+
+def _course_facet_key(course) -> tuple:
+    return facet_key(course.category, course.level, course.published, course.rating, course.duration)
+
+
+FACET_COLUMNS = (Course.category, Course.level, Course.published, Course.rating, Course.duration)
+FACET_KEY_FIELDS = ("category", "level", "published", "rating_bucket", "duration_bucket")
+
+
+def _adjust_facet_counts(db: Session, added: Iterable[tuple] = (), removed: Iterable[tuple] = ()) -> None:
+    """
+    Apply a write's facet changes to course_facet_counts, in the write's own transaction.
+    One upsert per changed row, in key order so concurrent writers lock rows in the same order.
+    """
+    changes = Counter(added)
+    changes.subtract(removed)
+    rows = [
+        {**dict(zip(FACET_KEY_FIELDS, key)), "count": change}
+        for key, change in sorted(changes.items(), key=lambda item: repr(item[0]))
+        if change
+    ]
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(CourseFacetCount)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(FACET_KEY_FIELDS),
+        set_={"count": CourseFacetCount.count + statement.excluded["count"]}
+    )
+    db.execute(statement, rows)
+
+
+def rebuild_facet_summary(db: Session) -> int:
+    """
+    Recount course_facet_counts from courses with one grouped query.
+    Needed after courses are loaded without the crud write paths (seed and benchmark data).
+    """
+    counts = Counter()
+    for *values, count in _facet_rows(db):
+        category, level, published, rating_bucket, duration_bucket = values
+        counts[(category, level, bool(published), rating_bucket, duration_bucket)] += count
+    db.execute(delete(CourseFacetCount))
+    if counts:
+        db.execute(insert(CourseFacetCount), [
+            {**dict(zip(FACET_KEY_FIELDS, key)), "count": count} for key, count in counts.items()
+        ])
+    db.commit()
+    invalidate_course_caches()
+    return len(counts)
+
+
+def ensure_facet_summary(db: Session) -> None:
+    """Build course_facet_counts if it is empty while courses are not (e.g. the table was just created)"""
+    if db.query(CourseFacetCount).first() is None and db.query(Course.id).first() is not None:
+        try:
+            rebuild_facet_summary(db)
+        except IntegrityError:
+            # Another worker built it at the same time
+            db.rollback()
+
+
+def _facet_summary_rows(db: Session) -> List[tuple]:
+    rows = facet_summary_cache.get("summary")
+    if rows is None:
+        generation = facet_summary_cache.generation
+        rows = [
+            tuple(row) for row in db.execute(
+                select(*(getattr(CourseFacetCount, field) for field in FACET_KEY_FIELDS), CourseFacetCount.count)
+                .where(CourseFacetCount.count > 0)
+            )
+        ]
+        facet_summary_cache.set("summary", rows, generation)
+    return rows
+
+
+def get_course_facets(db: Session, filters: Optional[CourseFilter] = None) -> dict:
+    """
+    Facet counts for the listing filters.
+    Each facet applies every filter except its own, so e.g. category counts stay
+    visible for all tabs while one is selected. Without search or range filters
+    the counts come from the course_facet_counts summary table and never touch
+    the courses table. Search and range filters cannot be precomputed, so those
+    run one grouped query over the matching courses.
+    """
+    filters = filters or CourseFilter()
+    category, level, published = filters.category, filters.level, filters.published
+    if filters.search or _has_range_filters(filters):
+        rows = _facet_rows(db, filters)
+    else:
+        rows = _facet_summary_rows(db)
+
+    selected = {"category": category or None, "level": level or None, "published": published}
+    dimensions = ["category", "level", "published", "rating", "duration"]
+    counts = {dimension: {} for dimension in dimensions}
+    total = 0
+    for row in rows:
+        values = dict(zip(dimensions, row[:5]))
+        count = row[5]
+        matches = {
+            dimension: selected[dimension] is None or values[dimension] == selected[dimension]
+            for dimension in selected
+        }
+        for dimension in dimensions:
+            # Ignore the facet's own filter when counting that facet
+            if all(ok for other, ok in matches.items() if other != dimension):
+                counts[dimension][values[dimension]] = counts[dimension].get(values[dimension], 0) + count
+        if all(matches.values()):
+            total += count
+
+    def ordered(dimension: str, labels: Optional[List[str]] = None) -> List[dict]:
+        if labels is not None:
+            return [{"value": label, "count": counts[dimension].get(label, 0)} for label in labels]
+        return [
+            {"value": value, "count": count}
+            for value, count in sorted(counts[dimension].items(), key=lambda item: (-item[1], str(item[0])))
+        ]
+
+    return {
+        "total": total,
+        "category": ordered("category"),
+        "level": ordered("level"),
+        "published": ordered("published"),
+        "rating": ordered("rating", RATING_LABELS),
+        "duration": ordered("duration", DURATION_LABELS),
+    }
+
+
+def iter_courses(
+    db: Session,
+    filters: Optional[CourseFilter] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    batch_size: int = 1000
+) -> Iterable[Any]:
+    """
+    Stream every course row matching the listing filters.
+    Rows are plain column tuples fetched `batch_size` at a time through a
+    server-side cursor, so the full result set is never held in memory.
+    """
+    full_text = _full_text_enabled(db)
+    statement = select(*Course.__table__.columns)
+    clauses = _course_filters(filters, full_text)
+    if clauses:
+        statement = statement.where(and_(*clauses))
+    statement = statement.order_by(*_course_ordering(sort_by, order, filters.search if filters else None, full_text))
+    
+    result = db.execute(statement.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield from partition
+
+
+def get_course_by_id(
+    db: Session,
+    course_id: str,
+    with_creator: bool = False,
+    columns: Optional[Iterable[str]] = None
+) -> Optional[Course]:
+    """Get a single course by ID, optionally joining its creator into the same query"""
+    query = db.query(Course)
+    if with_creator:
+        query = query.options(joinedload(Course.creator))
+    query = _load_columns(query, columns, "created_by" if with_creator else None)
+    return query.filter(Course.id == course_id).first()
+
+
+def get_courses_by_ids(db: Session, course_ids: List[str], with_creator: bool = False) -> dict[str, Course]:
+    """Map course id -> course for the given ids with one IN query per batch (missing ids are absent)"""
+    courses = {}
+    for batch in _batches(list(set(course_ids)), BULK_BATCH_SIZE):
+        query = db.query(Course)
+        if with_creator:
+            query = query.options(joinedload(Course.creator))
+        courses.update({course.id: course for course in query.filter(Course.id.in_(batch))})
+    return courses
 
 
 def create_course(db: Session, course: CourseCreate, user_id: str) -> Course:
@@ -112,7 +631,9 @@ def create_course(db: Session, course: CourseCreate, user_id: str) -> Course:
         created_by=user_id
     )
     db.add(db_course)
+    _adjust_facet_counts(db, added=[_course_facet_key(db_course)])
     db.commit()
+    invalidate_course_caches()
     db.refresh(db_course)
     return db_course
 
@@ -121,22 +642,119 @@ def update_course(db: Session, db_course: Course, course_update: CourseUpdate) -
     """Update an existing course"""
     update_data = course_update.dict(exclude_unset=True)
     
+    previous_key = _course_facet_key(db_course)
     for field, value in update_data.items():
         setattr(db_course, field, value)
     
     db_course.updated_at = datetime.utcnow()
+    _adjust_facet_counts(db, added=[_course_facet_key(db_course)], removed=[previous_key])
     db.commit()
+    invalidate_course_caches()
     db.refresh(db_course)
     return db_course
 
 
 def delete_course(db: Session, db_course: Course) -> bool:
     """Delete a course"""
+    _adjust_facet_counts(db, removed=[_course_facet_key(db_course)])
     db.delete(db_course)
     db.commit()
+    invalidate_course_caches()
     return True
 
 
+# Bulk course operations
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 500))
+
+
+def _batches(items: list, size: int) -> Iterable[list]:
+    """Split a list into consecutive chunks of at most `size` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def create_courses(db: Session, courses: List[CourseCreate], user_id: Optional[str]) -> List[str]:
+    """
+    Create many courses in a single transaction.
+    Rows are inserted with one multi-row INSERT per batch; returns the new ids in input order.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            **course.model_dump(mode="json"),
+            "id": str(uuid.uuid4()),
+            "created_by": user_id,
+            "created_at": now,
+            "updated_at": now
+        }
+        for course in courses
+    ]
+    for batch in _batches(rows, BULK_BATCH_SIZE):
+        db.execute(insert(Course), batch)
+    _adjust_facet_counts(db, added=[
+        facet_key(row["category"], row["level"], row["published"], row["rating"], row["duration"])
+        for row in rows
+    ])
+    db.commit()
+    invalidate_course_caches()
+    return [row["id"] for row in rows]
+
+
+def get_course_owners(db: Session, course_ids: List[str]) -> dict[str, Optional[str]]:
+    """Map course id -> creator id for the given ids in a single query (missing ids are absent)"""
+    owners = {}
+    for batch in _batches(list(set(course_ids)), BULK_BATCH_SIZE):
+        rows = db.execute(select(Course.id, Course.created_by).where(Course.id.in_(batch)))
+        owners.update({course_id: created_by for course_id, created_by in rows})
+    return owners
+
+
+def update_courses(db: Session, updates: List[CourseBulkUpdate]) -> None:
+    """Apply many partial course updates in a single transaction (bulk UPDATE by primary key)"""
+    now = datetime.utcnow()
+    rows = [
+        {**item.model_dump(mode="json", exclude_unset=True), "id": item.id, "updated_at": now}
+        for item in updates
+    ]
+    added, removed = [], []
+    for batch in _batches(rows, BULK_BATCH_SIZE):
+        # Facet values before the update, to move each course to its new summary row
+        previous = {
+            course_id: dict(zip(("category", "level", "published", "rating", "duration"), values))
+            for course_id, *values in db.execute(
+                select(Course.id, *FACET_COLUMNS).where(Course.id.in_([row["id"] for row in batch]))
+            )
+        }
+        db.execute(update(Course), batch)
+        for row in batch:
+            if row["id"] in previous:
+                before = previous[row["id"]]
+                after = {**before, **{name: row[name] for name in before if name in row}}
+                removed.append(facet_key(**before))
+                added.append(facet_key(**after))
+                previous[row["id"]] = after
+    _adjust_facet_counts(db, added=added, removed=removed)
+    db.commit()
+    invalidate_course_caches()
+
+
+def delete_courses(db: Session, course_ids: List[str]) -> int:
+    """Delete many courses in a single transaction; returns the number of rows deleted"""
+    removed = []
+    for batch in _batches(list(set(course_ids)), BULK_BATCH_SIZE):
+        rows = db.execute(delete(Course).where(Course.id.in_(batch)).returning(*FACET_COLUMNS)).all()
+        removed.extend(facet_key(*values) for values in rows)
+    _adjust_facet_counts(db, removed=removed)
+    db.commit()
+    invalidate_course_caches()
+    return len(removed)
+
+
 def get_user_courses(db: Session, user_id: str) -> List[Course]:
-    """Get all courses created by a user"""
-    return db.query(Course).filter(Course.created_by == user_id).all()
\ No newline at end of file
+    """Get all courses created by a user, newest first (a stable order keeps the ETag stable)"""
+    return (
+        db.query(Course)
+        .filter(Course.created_by == user_id)
+        .order_by(Course.created_at.desc(), Course.id)
+        .all()
+    )
\ No newline at end of file
@@ -7,19 +7,61 @@ from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
 
+from app.metrics import InstrumentedQueuePool, instrument_engine
+from app.profiling import query_profiler
+
 # Load environment variables
 load_dotenv()
 
 # Get database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Connection pool profiles, selected with DB_POOL_PROFILE.
+# pool_timeout is how long a request waits for a free connection before it gets a 503.
+POOL_PROFILES = {
+    # Checks every connection with a round trip before use; safest default
+    "default": {"pool_size": 10, "max_overflow": 20, "pool_pre_ping": True, "pool_recycle": -1, "pool_timeout": 5},
+    # No pre-ping round trip; connections are replaced before the server or a proxy drops them
+    "recycle": {"pool_size": 10, "max_overflow": 20, "pool_pre_ping": False, "pool_recycle": 300, "pool_timeout": 5},
+    # For small database plans and many app instances sharing a connection limit
+    "small": {"pool_size": 3, "max_overflow": 2, "pool_pre_ping": True, "pool_recycle": -1, "pool_timeout": 3},
+}
+
+# Individual settings override the profile: DB_POOL_SIZE=20, DB_POOL_PRE_PING=false, ...
+POOL_OVERRIDES = {
+    "pool_size": ("DB_POOL_SIZE", int),
+    "max_overflow": ("DB_MAX_OVERFLOW", int),
+    "pool_pre_ping": ("DB_POOL_PRE_PING", lambda value: value.lower() in ("1", "true", "yes")),
+    "pool_recycle": ("DB_POOL_RECYCLE", int),
+    "pool_timeout": ("DB_POOL_TIMEOUT", float),
+}
+
+
+def pool_settings() -> dict:
+    """Engine pool arguments for the configured profile and overrides"""
+    profile = os.getenv("DB_POOL_PROFILE", "default")
+    if profile not in POOL_PROFILES:
+        print(f"Warning: unknown DB_POOL_PROFILE {profile!r}, using 'default'")
+        profile = "default"
+    settings = dict(POOL_PROFILES[profile])
+    for name, (variable, parse) in POOL_OVERRIDES.items():
+        value = os.getenv(variable)
+        if value:
+            settings[name] = parse(value)
+    return settings
+
+
+POOL_SETTINGS = pool_settings()
+
 # Create SQLAlchemy engine
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    poolclass=InstrumentedQueuePool,
+    **POOL_SETTINGS
 )
+instrument_engine(engine)
+# Slow-query log and SQL breakdown; off unless SQL_PROFILING is set or toggled via /api/debug/profiling
+query_profiler.install(engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -32,6 +74,10 @@ def get_db():
     """
     Generator function that yields database sessions.
     Ensures proper cleanup after request completion.
+
+    Sessions are synchronous: route handlers and dependencies that use them
+    are declared with plain `def` so FastAPI runs them in its worker threadpool
+    instead of blocking the event loop.
     """
     db = SessionLocal()
     try:
@@ -0,0 +1,77 @@
+"""
+Streaming course catalog export (NDJSON / CSV)
+
+Rows are encoded one at a time and emitted in ~64 KB chunks, optionally
+gzip-compressed on the fly, so memory use stays flat for any catalog size.
+"""
+from typing import Iterable, Iterator, Any
+from datetime import datetime
+import csv
+import io
+import json
+import zlib
+
+from app.schemas import CourseResponse
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_FIELDS = list(CourseResponse.model_fields)
+CHUNK_SIZE = 64 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _encode_lines(rows: Iterable[Any], fmt: str) -> Iterator[str]:
+    """Yield one encoded text record per row (CSV starts with a header line)"""
+    if fmt == "ndjson":
+        for row in rows:
+            mapping = row._mapping
+            record = {field: mapping[field] for field in EXPORT_FIELDS}
+            yield json.dumps(record, default=_json_default, separators=(",", ":")) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        mapping = row._mapping
+        writer.writerow([
+            mapping[field].isoformat() if isinstance(mapping[field], datetime) else mapping[field]
+            for field in EXPORT_FIELDS
+        ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def encode_rows(rows: Iterable[Any], fmt: str, compress: bool = False) -> Iterator[bytes]:
+    """Encode course rows as NDJSON or CSV byte chunks, gzip-compressed if requested"""
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    pending, size = [], 0
+
+    def flush() -> bytes:
+        data = "".join(pending).encode()
+        pending.clear()
+        return compressor.compress(data) if compressor else data
+
+    for line in _encode_lines(rows, fmt):
+        pending.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            size = 0
+            chunk = flush()
+            if chunk:
+                yield chunk
+
+    tail = flush()
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
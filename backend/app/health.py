@@ -0,0 +1,50 @@
+"""
+Readiness checks: a bounded database ping
+"""
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional
+import os
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+READINESS_DB_TIMEOUT = float(os.getenv("READINESS_DB_TIMEOUT", 2.0))
+
+
+class DatabaseProbe:
+    """
+    Runs `SELECT 1` on a dedicated thread and waits at most `timeout` seconds.
+    A ping that hangs is not retried until it returns, so a stuck database
+    never ties up more than one probe thread.
+    """
+
+    def __init__(self, engine: Engine, timeout: float = READINESS_DB_TIMEOUT):
+        self.engine = engine
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-probe")
+        self._lock = threading.Lock()
+        self._in_flight = None
+
+    def _ping(self) -> None:
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    def ping(self) -> dict:
+        """Return {"ok", "latency_ms", "error"} for one database round trip"""
+        with self._lock:
+            if self._in_flight is not None and not self._in_flight.done():
+                return {"ok": False, "latency_ms": None, "error": "previous ping still running"}
+            start = time.perf_counter()
+            self._in_flight = future = self._executor.submit(self._ping)
+
+        error: Optional[str] = None
+        try:
+            future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            error = f"timed out after {self.timeout}s"
+        except Exception as e:
+            error = str(e).splitlines()[0] if str(e) else type(e).__name__
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        return {"ok": error is None, "latency_ms": latency_ms, "error": error}
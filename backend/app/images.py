@@ -0,0 +1,243 @@
+"""
+Course image derivatives
+
+Resizes assets to a fixed set of widths and re-encodes them as AVIF/WebP when
+Pillow supports it. Derivatives are rendered in a process pool, so resizing
+never runs on the event loop, and kept in a disk cache that evicts the least
+recently used files once it grows past IMAGE_CACHE_MAX_BYTES.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow is optional; without it only the originals are served
+    Image = None
+    features = None
+
+# srcset widths; requests are rounded up to the next bucket so the cache stays bounded
+IMAGE_WIDTHS = tuple(sorted(int(width) for width in os.getenv("IMAGE_WIDTHS", "160,320,480,640,960,1280").split(",")))
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", 2))
+
+# Pillow format name, media type and encoder options per output format
+FORMATS = {
+    "avif": ("AVIF", "image/avif", {"quality": 50, "speed": 6}),
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "png": ("PNG", "image/png", {"optimize": True}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 82, "progressive": True, "optimize": True}),
+}
+SOURCE_FORMATS = {".png": "png", ".jpg": "jpeg", ".jpeg": "jpeg", ".webp": "webp"}
+
+
+def _pool_context():
+    """forkserver where the platform has it, spawn otherwise"""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Workers fork from a server that has already imported the renderer and Pillow
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def available_formats() -> set:
+    """Output formats this Pillow build can encode"""
+    if Image is None:
+        return set()
+    available = {"png", "jpeg"}
+    for name in ("webp", "avif"):
+        if features.check(name):
+            available.add(name)
+    return available
+
+
+def bucket_width(width: int) -> int:
+    """Round a requested width up to the nearest configured bucket"""
+    for bucket in IMAGE_WIDTHS:
+        if width <= bucket:
+            return bucket
+    return IMAGE_WIDTHS[-1]
+
+
+def render_derivative(source: str, target: str, width: int, output_format: str) -> int:
+    """
+    Resize `source` to at most `width` pixels wide and write it to `target`.
+    Runs in a worker process; returns the size of the written file.
+    """
+    pillow_format, _, options = FORMATS[output_format]
+    with Image.open(source) as image:
+        image.load()
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+        if output_format == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        elif image.mode == "P":
+            image = image.convert("RGBA")
+        # Write next to the target and rename, so readers never see a partial file
+        partial = f"{target}.{os.getpid()}.tmp"
+        image.save(partial, pillow_format, **options)
+    os.replace(partial, target)
+    return os.path.getsize(target)
+
+
+class DiskLRUCache:
+    """
+    Files in a directory, evicted least recently used first past max_bytes.
+    The index is rebuilt from access times on startup; hits refresh the access time
+    (never the mtime, which the derivative's ETag is derived from).
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        directory.mkdir(parents=True, exist_ok=True)
+        files = [path for path in directory.iterdir() if path.is_file() and not path.name.endswith(".tmp")]
+        for path in sorted(files, key=lambda path: path.stat().st_atime):
+            size = path.stat().st_size
+            self._entries[path.name] = size
+            self._total += size
+
+    def get(self, name: str) -> Optional[Path]:
+        path = self.directory / name
+        with self._lock:
+            if name not in self._entries:
+                return None
+            if not path.exists():
+                # Evicted by another worker process sharing the directory
+                self._total -= self._entries.pop(name)
+                return None
+            self._entries.move_to_end(name)
+        os.utime(path, ns=(time.time_ns(), path.stat().st_mtime_ns))
+        return path
+
+    def add(self, name: str, size: int) -> None:
+        with self._lock:
+            self._total += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                oldest, oldest_size = self._entries.popitem(last=False)
+                self._total -= oldest_size
+                (self.directory / oldest).unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"files": len(self._entries), "bytes": self._total, "max_bytes": self.max_bytes}
+
+
+class ImageService:
+    """Serve width-bucketed derivatives of the files in assets_dir"""
+
+    def __init__(self, assets_dir: Path, cache_dir: Path,
+                 max_bytes: int = IMAGE_CACHE_MAX_BYTES, workers: int = IMAGE_WORKERS):
+        self.assets_dir = assets_dir.resolve()
+        self.cache = DiskLRUCache(cache_dir, max_bytes)
+        self.workers = workers
+        self.formats = available_formats()
+        # Set once the /assets mount has built it; enables content-hashed derivative URLs
+        self.manifest = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: dict[str, Future] = {}
+        # Reentrant: a render that finishes during submit runs its callback under the lock
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.formats)
+
+    def resolve(self, name: str) -> tuple[Optional[Path], bool]:
+        """
+        Resolve a plain or content-hashed asset name inside assets_dir.
+        Returns (source path or None if missing/not an image, whether the name was hashed).
+        """
+        hashed = False
+        if self.manifest is not None:
+            original, hashed = self.manifest.resolve(name)
+            name = original or name
+        path = (self.assets_dir / name).resolve()
+        if not path.is_relative_to(self.assets_dir) or not path.is_file():
+            return None, False
+        if path.suffix.lower() not in SOURCE_FORMATS:
+            return None, False
+        return path, hashed
+
+    def negotiate(self, source: Path, accept: str, requested: Optional[str] = None) -> Optional[str]:
+        """
+        Pick the output format: an explicit request if it can be encoded, else the
+        best of AVIF/WebP the client accepts, else the source's own format.
+        """
+        if requested:
+            return requested if requested in self.formats else None
+        for name in ("avif", "webp"):
+            if name in self.formats and FORMATS[name][1] in accept:
+                return name
+        fallback = SOURCE_FORMATS[source.suffix.lower()]
+        return fallback if fallback in self.formats else "png"
+
+    def _cache_name(self, source: Path, width: int, output_format: str) -> str:
+        # The source's size and mtime are part of the key, so replacing an asset
+        # makes its old derivatives unreachable (they age out of the LRU)
+        stat = source.stat()
+        version = hashlib.blake2b(
+            f"{source.relative_to(self.assets_dir)}:{stat.st_size}:{stat.st_mtime_ns}".encode(),
+            digest_size=8
+        ).hexdigest()
+        return f"{source.stem}-{version}-{width}.{output_format}"
+
+    def _submit(self, name: str, source: Path, width: int, output_format: str) -> Future:
+        """Start (or join) the render of one derivative"""
+        with self._lock:
+            future = self._pending.get(name)
+            if future is None:
+                if self._pool is None:
+                    # Not fork: forking the threaded server copies locks other threads may hold
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+                future = self._pool.submit(
+                    render_derivative, str(source), str(self.cache.directory / name), width, output_format
+                )
+                self._pending[name] = future
+
+                def done(finished: Future) -> None:
+                    with self._lock:
+                        self._pending.pop(name, None)
+                    if not finished.cancelled() and finished.exception() is None:
+                        self.cache.add(name, finished.result())
+
+                future.add_done_callback(done)
+            return future
+
+    async def derivative(self, source: Path, width: int, output_format: str) -> Path:
+        """Path of the cached derivative, rendering it in the process pool if needed"""
+        name = self._cache_name(source, bucket_width(width), output_format)
+        path = self.cache.get(name)
+        if path is not None:
+            return path
+        await asyncio.wrap_future(self._submit(name, source, bucket_width(width), output_format))
+        return self.cache.directory / name
+
+    def srcset(self, url_prefix: str, name: str) -> str:
+        """`srcset` attribute value listing every width bucket of an asset (hashed names when known)"""
+        if self.manifest is not None and name in self.manifest.assets:
+            name = self.manifest.assets[name]["hashed"]
+        return ", ".join(f"{url_prefix}/{width}/{name} {width}w" for width in IMAGE_WIDTHS)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {"formats": sorted(self.formats), "rendering": pending, **self.cache.stats()}
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
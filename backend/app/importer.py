@@ -0,0 +1,108 @@
+"""
+Streaming course catalog import (NDJSON / CSV)
+
+Rows are parsed and validated one at a time and written in fixed-size batches,
+so memory use stays flat no matter how large the input is.
+"""
+from typing import Optional, Iterator, Iterable, Callable, TextIO, Any
+import csv
+import json
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.schemas import CourseCreate, ImportLineError, ImportReport
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> Optional[str]:
+    """Guess the import format from a file name or content type"""
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type or "jsonlines" in content_type:
+        return "ndjson"
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    return None
+
+
+def iter_ndjson(stream: TextIO) -> Iterator[tuple[int, Any]]:
+    """Yield (line number, parsed object or error message) for each non-blank line"""
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"Invalid JSON: {e.msg}"
+
+
+def iter_csv(stream: TextIO) -> Iterator[tuple[int, Any]]:
+    """Yield (line number, row dict) for each CSV record; empty cells fall back to defaults"""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in (None, "")}
+
+
+def validate_rows(rows: Iterable[tuple[int, Any]]) -> Iterator[tuple[int, Any]]:
+    """Yield (line number, CourseCreate) for valid rows and (line number, error message) otherwise"""
+    for line_no, row in rows:
+        if isinstance(row, str):
+            yield line_no, row
+        elif not isinstance(row, dict):
+            yield line_no, "Expected a JSON object"
+        else:
+            try:
+                yield line_no, CourseCreate.model_validate(row)
+            except ValidationError as e:
+                yield line_no, "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                )
+
+
+def import_courses(
+    db: Session,
+    stream: TextIO,
+    fmt: str,
+    user_id: Optional[str] = None,
+    batch_size: int = crud.BULK_BATCH_SIZE,
+    max_errors: int = 100,
+    on_progress: Optional[Callable[[ImportReport], None]] = None
+) -> ImportReport:
+    """
+    Import courses from a text stream, committing every `batch_size` valid rows.
+    Only the first `max_errors` line errors are kept in the report; all are counted.
+    on_progress is called with the running report after each batch.
+    """
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    rows = iter_ndjson(stream) if fmt == "ndjson" else iter_csv(stream)
+    report = ImportReport()
+    batch = []
+
+    def flush():
+        crud.create_courses(db, batch, user_id=user_id)
+        report.imported += len(batch)
+        batch.clear()
+        if on_progress:
+            on_progress(report)
+
+    for line_no, result in validate_rows(rows):
+        report.processed += 1
+        if isinstance(result, CourseCreate):
+            batch.append(result)
+            if len(batch) >= batch_size:
+                flush()
+        else:
+            report.failed += 1
+            if len(report.errors) < max_errors:
+                report.errors.append(ImportLineError(line=line_no, error=result))
+            else:
+                report.errors_truncated = True
+
+    if batch:
+        flush()
+    return report
@@ -2,16 +2,24 @@
 Course Catalog API - Main Application
 FastAPI backend with PostgreSQL, JWT authentication, and full CRUD operations
 """
-from fastapi import FastAPI, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 import os
-from pathlib import Path
 from dotenv import load_dotenv
-
-from app.database import engine, Base
-from app.routers import users, courses
+import anyio
+
+from app.database import engine, Base, POOL_SETTINGS, SessionLocal
+from app import crud
+from app.auth import password_hasher
+from app.compression import CompressionMiddleware
+from app.health import DatabaseProbe
+from app.metrics import RequestMetricsMiddleware, pool_metrics, render_prometheus
+from app.profiling import SQLProfileMiddleware
+from app.routers import users, courses, images, debug
+from app.static import ASSETS_DIR, ASSET_BUILD_DIR, AssetStaticFiles
 
 # Load environment variables
 load_dotenv()
@@ -19,13 +27,32 @@ load_dotenv()
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Fill the facet summary table if it was just created next to existing courses
+with SessionLocal() as db:
+    crud.ensure_facet_summary(db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup/shutdown hooks
+    """
+    # Database-bound handlers are sync and run in this threadpool;
+    # THREADPOOL_SIZE lets deployments match it to the connection pool (anyio defaults to 40)
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = int(os.getenv("THREADPOOL_SIZE", limiter.total_tokens))
+    yield
+    images.image_service.shutdown()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Course Catalog API",
     description="API for managing course catalog with authentication, filtering, sorting, and pagination",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -39,17 +66,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Server-Timing SQL breakdown for requests sending X-SQL-Profile (while profiling is on)
+app.add_middleware(SQLProfileMiddleware)
+
+# Compress JSON/text responses above COMPRESSION_MIN_SIZE (static assets are precompressed)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency, status, size and SQL metrics for /metrics; added last so it wraps everything else
+app.add_middleware(RequestMetricsMiddleware)
 
-# Get the absolute path to the assets directory
-BASE_DIR = Path(__file__).resolve().parent.parent 
-ASSETS_DIR = BASE_DIR / "assets"
 
 # Create assets directory if it doesn't exist
 ASSETS_DIR.mkdir(exist_ok=True)
 
 # Mount the assets directory to serve static files
+# (builds content-hashed names and precompressed variants; see app/static.py)
+assets_app = None
 try:
-    app.mount("/assets", StaticFiles(directory=str(ASSETS_DIR)), name="assets")
+    assets_app = AssetStaticFiles(directory=ASSETS_DIR, build_dir=ASSET_BUILD_DIR)
+    app.mount("/assets", assets_app, name="assets")
+    images.image_service.manifest = assets_app.manifest
+    courses.asset_manifest = assets_app.manifest
     print(f"Static files mounted successfully from: {ASSETS_DIR}")
 except Exception as e:
     print(f"Warning: Could not mount static files: {e}")
@@ -57,6 +94,8 @@ except Exception as e:
 # Include routers
 app.include_router(users.router)
 app.include_router(courses.router)
+app.include_router(images.router)
+app.include_router(debug.router)
 
 
 @app.get("/", tags=["Root"])
@@ -74,42 +113,86 @@ async def root():
     }
 
 
+database_probe = DatabaseProbe(engine)
+
+
 @app.get("/api/health", tags=["Health"])
-async def health_check():
+@app.get("/api/health/live", tags=["Health"])
+async def liveness():
+    """
+    Liveness probe - the process is up and serving requests (no I/O)
+    """
+    return {"status": "healthy"}
+
+
+@app.get("/api/health/ready", tags=["Health"])
+def readiness(response: Response):
     """
-    Health check endpoint
+    Readiness probe - pings the database (bounded by READINESS_DB_TIMEOUT)
+    and reports pool usage. Responds 503 while the database is unreachable.
     """
+    database = database_probe.ping()
+    if not database["ok"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
     return {
-        "status": "healthy",
-        "database": "connected",
+        "status": "ready" if database["ok"] else "unavailable",
+        "database": database,
+        "pool": pool_metrics.snapshot(engine.pool),
+        "password_hashing": password_hasher.stats(),
+        "images": images.image_service.stats(),
         "static_files": {
-            "enabled": True,
+            "enabled": assets_app is not None,
             "path": str(ASSETS_DIR),
-            "exists": ASSETS_DIR.exists(),
-            "files": list(ASSETS_DIR.glob("*")) if ASSETS_DIR.exists() else []
+            "files": len(assets_app.manifest.assets) if assets_app else 0
         }
     }
 
 
+@app.get("/api/metrics/pool", tags=["Health"])
+async def pool_metrics_endpoint():
+    """
+    Connection pool saturation: in-use/overflow counts, checkout latency,
+    wait time, pre-ping cost and how often the pool was exhausted
+    """
+    return {
+        "profile": os.getenv("DB_POOL_PROFILE", "default"),
+        "settings": POOL_SETTINGS,
+        **pool_metrics.snapshot(engine.pool)
+    }
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Request and connection pool metrics in the Prometheus text exposition format
+    """
+    return PlainTextResponse(
+        render_prometheus(engine.pool),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/api/assets/list", tags=["Assets"])
-async def list_assets():
+def list_assets():
     """
-    List all available asset files
+    List all available asset files (from the cached asset manifest)
     """
-    if not ASSETS_DIR.exists():
+    if assets_app is None:
         return {
             "error": "Assets directory not found",
             "path": str(ASSETS_DIR)
         }
     
-    files = []
-    for file_path in ASSETS_DIR.glob("*"):
-        if file_path.is_file():
-            files.append({
-                "name": file_path.name,
-                "url": f"/assets/{file_path.name}",
-                "size": file_path.stat().st_size
-            })
+    manifest = assets_app.refresh()
+    files = [
+        {
+            "name": name,
+            "url": f"/assets/{name}",
+            "hashed_url": manifest.url(name),
+            "size": entry["size"]
+        }
+        for name, entry in manifest.assets.items()
+    ]
     
     return {
         "assets_directory": str(ASSETS_DIR),
@@ -118,6 +201,19 @@ async def list_assets():
     }
 
 
+@app.exception_handler(PoolTimeoutError)
+async def pool_exhausted_handler(request, exc):
+    """
+    No database connection became free within pool_timeout: fail fast with 503
+    so clients and load balancers back off instead of piling up more requests
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """
@@ -0,0 +1,413 @@
+"""
+In-process metrics: latency histograms, connection pool instrumentation,
+per-route request metrics and the Prometheus text exposition served on /metrics
+
+Request metrics are written only from the event loop thread (the middleware
+records a request once its response has been sent), so their histograms and
+counters need no locks. SQL statements run in worker threads; they are added
+to a per-request object reached through a context variable, which Starlette
+copies into the threadpool along with the rest of the request's context.
+"""
+from contextvars import ContextVar
+from typing import Optional
+import bisect
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds in seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Response body bytes (after compression, as sent)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# SQL statements per request
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Anything else is reported as OTHER, so clients cannot create label values
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """
+    Cumulative histogram with preallocated buckets and no locking.
+    Only safe with a single writer; see LatencyHistogram for the thread-safe variant.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._count += 1
+        self._sum += value
+        if value > self._max:
+            self._max = value
+
+    def _state(self) -> tuple:
+        return list(self._counts), self._count, self._sum, self._max
+
+    def snapshot(self) -> dict:
+        """Count, sum, max and cumulative bucket counts (Prometheus style)"""
+        counts, count, total, maximum = self._state()
+        cumulative, running = [], 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+        return {"count": count, "sum": total, "max": maximum, "buckets": cumulative}
+
+
+class LatencyHistogram(Histogram):
+    """Thread-safe cumulative histogram of durations in seconds"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(buckets)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            super().observe(seconds)
+
+    def _state(self) -> tuple:
+        with self._lock:
+            return super()._state()
+
+    def summary(self) -> dict:
+        """Milliseconds summary for JSON endpoints"""
+        snapshot = self.snapshot()
+        count = snapshot["count"]
+        return {
+            "count": count,
+            "avg_ms": round(snapshot["sum"] / count * 1000, 3) if count else 0.0,
+            "max_ms": round(snapshot["max"] * 1000, 3),
+            "p95_ms": _quantile_ms(snapshot, 0.95),
+        }
+
+
+def _quantile_ms(snapshot: dict, quantile: float) -> Optional[float]:
+    """Upper bound of the bucket holding the quantile (None for the +Inf bucket or no samples)"""
+    if not snapshot["count"]:
+        return None
+    target = snapshot["count"] * quantile
+    for bound, cumulative in snapshot["buckets"]:
+        if cumulative >= target:
+            return None if bound == float("inf") else bound * 1000
+    return None
+
+
+class PoolMetrics:
+    """Counters and latencies for one engine's connection pool"""
+
+    def __init__(self):
+        self.checkout = LatencyHistogram()   # connect(): waiting + pre-ping
+        self.wait = LatencyHistogram()       # waiting for a free slot (or opening a connection)
+        self.pre_ping = LatencyHistogram()
+        self._lock = threading.Lock()
+        self.counters = {
+            "checkouts": 0,
+            "connections_opened": 0,
+            "invalidated": 0,
+            "exhausted": 0,
+            "pre_ping_failures": 0,
+        }
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def counter_values(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+    def snapshot(self, pool) -> dict:
+        counters = self.counter_values()
+        state = {"class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            state.update(
+                size=pool.size(),
+                in_use=pool.checkedout(),
+                idle=pool.checkedin(),
+                # QueuePool counts overflow up from -size; only positive values are extra connections
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+                timeout=pool.timeout()
+            )
+        return {
+            **state,
+            **counters,
+            "checkout_latency": self.checkout.summary(),
+            "wait_time": self.wait.summary(),
+            "pre_ping": self.pre_ping.summary(),
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout latency, wait time and exhaustion in pool_metrics"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_metrics.checkout.observe(time.perf_counter() - start)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.increment("exhausted")
+            raise
+        finally:
+            pool_metrics.wait.observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count pool events and time pre-ping round trips for an engine"""
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.increment("checkouts")
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_metrics.increment("connections_opened")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_metrics.increment("invalidated")
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        stats = _request_stats.get()
+        if stats is not None and context is not None:
+            stats.statements += 1
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        stats = _request_stats.get()
+        started = getattr(context, "_metrics_started", None)
+        if stats is not None and started is not None:
+            stats.db_seconds += time.perf_counter() - started
+
+    dialect = engine.dialect
+    do_ping = dialect.do_ping
+
+    def timed_ping(dbapi_connection):
+        start = time.perf_counter()
+        try:
+            alive = do_ping(dbapi_connection)
+        except Exception:
+            pool_metrics.increment("pre_ping_failures")
+            raise
+        finally:
+            pool_metrics.pre_ping.observe(time.perf_counter() - start)
+        if not alive:
+            pool_metrics.increment("pre_ping_failures")
+        return alive
+
+    dialect.do_ping = timed_ping
+
+
+class RequestStats:
+    """SQL work done on behalf of one request (filled in from worker threads)"""
+    __slots__ = ("statements", "db_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class RouteMetrics:
+    """Histograms and status counts for one (method, route template) pair"""
+    __slots__ = ("latency", "size", "statements", "db_time", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_time = Histogram(LATENCY_BUCKETS)
+        self.statuses: dict[int, int] = {}
+
+
+class RequestMetrics:
+    """Per-route request metrics; written only from the event loop thread"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+
+    def record(self, method: str, route: str, status_code: int, seconds: float,
+               size: int, stats: RequestStats) -> None:
+        key = (method, route)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics()
+        metrics.latency.observe(seconds)
+        metrics.size.observe(size)
+        metrics.statements.observe(stats.statements)
+        metrics.db_time.observe(stats.db_seconds)
+        metrics.statuses[status_code] = metrics.statuses.get(status_code, 0) + 1
+
+
+request_metrics = RequestMetrics()
+
+
+def route_template(scope: Scope) -> str:
+    """
+    The matched route's path template (`/api/courses/{course_id}`), so label
+    values stay bounded no matter which ids are requested
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope and scope.get("root_path", "") != scope.get("app_root_path", ""):
+        # A mounted app (static assets): Mount sets root_path to the mount prefix
+        return scope["root_path"][len(scope.get("app_root_path", "")):] + "/{path}"
+    return UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status, response size, SQL statement
+    count and database time per route. Add it last so it is the outermost layer
+    and measures the compressed bytes actually sent.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        size = 0
+
+        async def send_counted(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_counted)
+        finally:
+            seconds = time.perf_counter() - start
+            self.metrics.in_flight -= 1
+            _request_stats.reset(token)
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+            self.metrics.record(method, route_template(scope), status_code, seconds, size, stats)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Exposition:
+    """Builds the Prometheus text format (version 0.0.4)"""
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def header(self, name: str, kind: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: float, **labels) -> None:
+        self.lines.append(f"{name}{_labels(**labels) if labels else ''} {_number(value)}")
+
+    def histogram(self, name: str, snapshot: dict, **labels) -> None:
+        for bound, cumulative in snapshot["buckets"]:
+            self.sample(f"{name}_bucket", cumulative, **labels, le=_number(float(bound)))
+        self.sample(f"{name}_sum", snapshot["sum"], **labels)
+        self.sample(f"{name}_count", snapshot["count"], **labels)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+# name, attribute on RouteMetrics, help text
+_ROUTE_HISTOGRAMS = (
+    ("http_request_duration_seconds", "latency", "Request latency by route template"),
+    ("http_response_size_bytes", "size", "Response body size by route template"),
+    ("http_request_db_statements", "statements", "SQL statements executed per request"),
+    ("http_request_db_duration_seconds", "db_time", "Time spent executing SQL per request"),
+)
+
+# name, PoolMetrics attribute, help text
+_POOL_HISTOGRAMS = (
+    ("db_pool_checkout_duration_seconds", "checkout", "Connection checkout latency, including pre-ping"),
+    ("db_pool_wait_duration_seconds", "wait", "Time spent waiting for a free pooled connection"),
+    ("db_pool_pre_ping_duration_seconds", "pre_ping", "Pre-ping round trip time"),
+)
+
+
+def render_prometheus(pool=None, metrics: RequestMetrics = request_metrics) -> str:
+    """Request and connection pool metrics in the Prometheus text exposition format"""
+    out = _Exposition()
+    routes = sorted(metrics.routes.items())
+
+    out.header("http_requests_in_flight", "gauge", "Requests currently being served")
+    out.sample("http_requests_in_flight", metrics.in_flight)
+
+    out.header("http_requests_total", "counter", "Requests by route template and status code")
+    for (method, route), route_metrics in routes:
+        for status_code, count in sorted(route_metrics.statuses.items()):
+            out.sample("http_requests_total", count, method=method, route=route, status=status_code)
+
+    for name, attribute, help_text in _ROUTE_HISTOGRAMS:
+        out.header(name, "histogram", help_text)
+        for (method, route), route_metrics in routes:
+            out.histogram(name, getattr(route_metrics, attribute).snapshot(), method=method, route=route)
+
+    for name, attribute, help_text in _POOL_HISTOGRAMS:
+        out.header(name, "histogram", help_text)
+        out.histogram(name, getattr(pool_metrics, attribute).snapshot())
+
+    for name, value in pool_metrics.counter_values().items():
+        out.header(f"db_pool_{name}_total", "counter", f"Connection pool {name.replace('_', ' ')}")
+        out.sample(f"db_pool_{name}_total", value)
+
+    if isinstance(pool, QueuePool):
+        for name, value, help_text in (
+            ("size", pool.size(), "Configured number of pooled connections"),
+            ("in_use", pool.checkedout(), "Connections currently checked out"),
+            ("idle", pool.checkedin(), "Connections idle in the pool"),
+            ("overflow", max(pool.overflow(), 0), "Connections open beyond pool_size"),
+        ):
+            out.header(f"db_pool_{name}", "gauge", help_text)
+            out.sample(f"db_pool_{name}", value)
+
+    return out.render()
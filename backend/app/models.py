@@ -1,12 +1,29 @@
 """
 SQLAlchemy Database Models
 """
-from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Text, Index, func, literal_column
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 import uuid
 
+# Text search configuration for course full-text search (PostgreSQL only)
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+EMPTY_TEXT = literal_column("''")
+
+
+def search_document(title, description):
+    """
+    Weighted tsvector for course full-text search.
+    Titles rank above descriptions; queries must use this exact expression
+    so PostgreSQL can match it against the GIN index on courses.
+    """
+    return func.setweight(
+        func.to_tsvector(SEARCH_CONFIG, func.coalesce(title, EMPTY_TEXT)), literal_column("'A'")
+    ).op("||")(
+        func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(description, EMPTY_TEXT)), literal_column("'B'"))
+    )
+
 
 class User(Base):
     """User model for authentication"""
@@ -47,4 +64,38 @@ class Course(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship to user
-    creator = relationship("User", back_populates="courses")
\ No newline at end of file
+    creator = relationship("User", back_populates="courses")
+
+    __table_args__ = (
+        # Composite indexes for the hot filter + sort combinations on /api/courses
+        Index("ix_courses_category_level_created_at", "category", "level", "created_at"),
+        Index("ix_courses_category_created_at", "category", "created_at"),
+        Index("ix_courses_published_created_at", "published", "created_at"),
+        Index("ix_courses_duration", "duration"),
+        # Sort indexes: (column, id) matches the ORDER BY with its id tiebreaker
+        Index("ix_courses_rating_id", "rating", "id"),
+        Index("ix_courses_credits_id", "credits", "id"),
+        Index("ix_courses_published_rating_id", "published", "rating", "id"),
+        Index(
+            "ix_courses_search_vector",
+            search_document(title, description),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+class CourseFacetCount(Base):
+    """
+    Course counts per facet combination, maintained by the course write paths
+    in crud.py in the same transaction as the write, so unfiltered facet
+    requests read this small table instead of grouping over courses
+    """
+    __tablename__ = "course_facet_counts"
+
+    category = Column(String, primary_key=True)
+    level = Column(String, primary_key=True)
+    # Courses with a NULL published flag are counted as unpublished
+    published = Column(Boolean, primary_key=True)
+    rating_bucket = Column(String, primary_key=True)
+    duration_bucket = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
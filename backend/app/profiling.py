@@ -0,0 +1,230 @@
+"""
+Opt-in SQL profiling: slow-query log, sampled EXPLAIN plans and a per-request
+SQL timing breakdown
+
+Off by default and switchable at runtime through /api/debug/profiling, so a
+latency spike can be investigated without a restart. While it is off the
+engine listeners only check a flag. Every process keeps its own settings, so
+with several workers toggle each of them (or run one worker per container).
+
+Only the shape of bound parameters (their types) is recorded, never their
+values. EXPLAIN runs on a separate pooled connection in a background thread,
+one plan at a time, and is rolled back afterwards.
+"""
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Optional
+import hmac
+import os
+import random
+import re
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Shared secret for the runtime toggle and the debug header; both are disabled when unset
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+PROFILE_HEADER = "X-SQL-Profile"
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+# Fraction of slow SELECTs whose plan is captured with EXPLAIN
+EXPLAIN_SAMPLE_RATE = float(os.getenv("EXPLAIN_SAMPLE_RATE", 0.1))
+EXPLAIN_TIMEOUT_MS = int(os.getenv("EXPLAIN_TIMEOUT_MS", 5000))
+SLOW_QUERY_HISTORY = 100
+# Per-request breakdown entries sent back in the Server-Timing header
+MAX_TIMING_ENTRIES = 20
+
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def token_matches(candidate: Optional[str]) -> bool:
+    return bool(PROFILING_TOKEN) and bool(candidate) and hmac.compare_digest(candidate, PROFILING_TOKEN)
+
+
+def normalize_statement(statement: str, limit: int = 500) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def _value_shape(parameters) -> str:
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def parameters_shape(parameters, executemany: bool) -> str:
+    """Parameter names and types, e.g. `{category_1: str, param_1: int}` or `25 x (...)`"""
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} x {_value_shape(rows[0])}" if rows else "0 rows"
+    return _value_shape(parameters)
+
+
+_request_queries: ContextVar[Optional[list]] = ContextVar("request_queries", default=None)
+
+
+class QueryProfiler:
+    """Engine listeners plus the runtime-adjustable profiling settings"""
+
+    def __init__(self, enabled: bool = False, slow_query_ms: float = SLOW_QUERY_MS,
+                 explain_sample_rate: float = EXPLAIN_SAMPLE_RATE):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.engine: Optional[Engine] = None
+        self.slow_queries: deque = deque(maxlen=SLOW_QUERY_HISTORY)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sql-explain")
+        self._lock = threading.Lock()
+        self._explaining: Optional[Future] = None
+
+    def settings(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "slow_query_ms": self.slow_query_ms,
+            "explain_sample_rate": self.explain_sample_rate,
+        }
+
+    def configure(self, **changes) -> dict:
+        for name, value in changes.items():
+            if value is not None:
+                setattr(self, name, value)
+        return self.settings()
+
+    def install(self, engine: Engine) -> None:
+        self.engine = engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+            if self.enabled and context is not None:
+                context._profile_started = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "_profile_started", None)
+            if started is not None:
+                self.record(statement, parameters, executemany, time.perf_counter() - started, cursor.rowcount)
+
+    def record(self, statement: str, parameters, executemany: bool, seconds: float, rowcount: int) -> None:
+        duration_ms = seconds * 1000
+        queries = _request_queries.get()
+        if queries is not None:
+            queries.append((statement, duration_ms))
+        if duration_ms < self.slow_query_ms:
+            return
+
+        entry = {
+            "at": time.time(),
+            "duration_ms": round(duration_ms, 3),
+            # DBAPI drivers report -1 when the row count of a SELECT is not known up front
+            "rows": rowcount if rowcount is not None and rowcount >= 0 else None,
+            "statement": normalize_statement(statement),
+            "parameters": parameters_shape(parameters, executemany),
+            "plan": None,
+        }
+        self.slow_queries.append(entry)
+        print(
+            f"Slow query ({entry['duration_ms']} ms, rows={entry['rows']}, "
+            f"params={entry['parameters']}): {entry['statement']}"
+        )
+        # Only plain SELECTs: EXPLAIN ANALYZE executes the statement
+        if (
+            not executemany
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < self.explain_sample_rate
+        ):
+            self._sample_plan(entry, statement, parameters)
+
+    def _sample_plan(self, entry: dict, statement: str, parameters) -> None:
+        """Queue an EXPLAIN for a slow query, unless one is already running"""
+        prefix = EXPLAIN_PREFIXES.get(self.engine.dialect.name)
+        if prefix is None:
+            return
+        with self._lock:
+            if self._explaining is not None and not self._explaining.done():
+                return
+            self._explaining = self._executor.submit(self._explain, entry, prefix + statement, parameters)
+
+    def _explain(self, entry: dict, statement: str, parameters) -> None:
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            if self.engine.dialect.name == "postgresql":
+                # EXPLAIN ANALYZE runs the query again; bound it like any other request
+                cursor.execute(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+            cursor.execute(statement, parameters)
+            # PostgreSQL returns one text line per row; SQLite's plan detail is the last column
+            plan = "\n".join(str(row[-1]) for row in cursor.fetchall())
+            cursor.close()
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+        finally:
+            connection.rollback()
+            connection.close()
+        entry["plan"] = plan
+        print(f"Plan for slow query: {entry['statement']}\n{plan}")
+
+    def report(self) -> dict:
+        return {**self.settings(), "slow_queries": list(reversed(self.slow_queries))}
+
+
+query_profiler = QueryProfiler(enabled=os.getenv("SQL_PROFILING", "false").lower() in ("1", "true", "yes"))
+
+
+def _server_timing(queries: list) -> str:
+    """
+    Server-Timing value: the total (`db`) followed by one entry per statement,
+    which browser dev tools show next to the request
+    """
+    total_ms = sum(duration_ms for _, duration_ms in queries)
+    entries = [f'db;dur={total_ms:.2f};desc="SQL statements: {len(queries)}"']
+    for index, (statement, duration_ms) in enumerate(queries[:MAX_TIMING_ENTRIES], start=1):
+        description = normalize_statement(statement, 80).replace('"', "'")
+        entries.append(f'sql{index};dur={duration_ms:.2f};desc="{description}"')
+    return ", ".join(entries)
+
+
+class SQLProfileMiddleware:
+    """
+    While profiling is enabled, requests sending `X-SQL-Profile: <PROFILING_TOKEN>`
+    get their SQL statements and timings back in a Server-Timing header
+    """
+
+    def __init__(self, app: ASGIApp, profiler: QueryProfiler = query_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.profiler.enabled
+            or not token_matches(Headers(scope=scope).get(PROFILE_HEADER))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        queries: list = []
+        token = _request_queries.set(queries)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                headers.append("Server-Timing", _server_timing(queries))
+                headers["X-SQL-Statements"] = str(len(queries))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_queries.reset(token)
@@ -1,84 +1,633 @@
 """
 Course API Routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, File, HTTPException, status, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
 from sqlalchemy.orm import Session
 from typing import Optional, List
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import io
+import json
 import math
+import os
 
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.schemas import (
     CourseCreate,
     CourseUpdate,
     CourseResponse,
     CourseWithCreator,
-    PaginatedResponse
+    PaginatedResponse,
+    CourseFilter,
+    CourseLevel,
+    CourseBulkUpdate,
+    CourseBulkDelete,
+    BulkItemResult,
+    BulkResponse,
+    CourseBatchRequest,
+    CourseBatchResponse,
+    ImportReport,
+    FacetsResponse,
+    COURSE_FIELDS,
+    COURSE_RESPONSE_FIELDS,
+    sparse_course_schema,
+    BULK_MAX_ITEMS
 )
 from app.models import User, Course
-from app import crud
+from app import crud, importer, exporter
 from app.auth import get_current_active_user
+from app.cache import CachedResponse, compute_etag, version_etag
 
 router = APIRouter(prefix="/api/courses", tags=["Courses"])
 
+# Set by main once the /assets mount has built it; course image_url values
+# are then returned as content-hashed (immutable) asset URLs
+asset_manifest = None
 
-@router.get("", response_model=PaginatedResponse)
-async def get_courses(
-    page: int = Query(1, ge=1, description="Page number"),
-    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+CourseList = TypeAdapter(List[CourseResponse])
+
+BATCH_MAX_IDS = int(os.getenv("BATCH_MAX_IDS", 100))
+
+
+def _http_date(value: datetime) -> str:
+    """Format a naive UTC timestamp as an HTTP date"""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against a cached entry"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified:
+        try:
+            return parsedate_to_datetime(entry.last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _json_response(request: Request, entry: CachedResponse) -> Response:
+    """
+    Return an already-serialized JSON body without re-validating it,
+    or an empty 304 when the client's copy is still current.
+    """
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.last_modified:
+        headers["Last-Modified"] = entry.last_modified
+    if _not_modified(request, entry):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def course_fields(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,rating")
+) -> Optional[tuple]:
+    """Parse a sparse fieldset; None means the full representation"""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(COURSE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return ("id",) + tuple(name for name in COURSE_FIELDS if name in requested and name != "id")
+
+
+def _cache_key(*parts) -> str:
+    """Response cache key; includes the asset manifest version, since bodies embed hashed image URLs"""
+    return crud.course_response_cache.make_key(*parts, asset_manifest.version if asset_manifest else None)
+
+
+def _hashed_image(item: dict) -> dict:
+    """Point a course dict's image_url at the hashed asset URL"""
+    if asset_manifest is not None and item.get("image_url"):
+        item["image_url"] = asset_manifest.hashed_url(item["image_url"])
+    return item
+
+
+def _with_hashed_image(course):
+    """Copy of a course schema instance with the hashed image URL"""
+    image_url = getattr(course, "image_url", None)
+    if asset_manifest is None or not image_url:
+        return course
+    return course.model_copy(update={"image_url": asset_manifest.hashed_url(image_url)})
+
+
+def _with_original_image(course):
+    """Store the plain asset URL when a client sends back the hashed one it was given"""
+    image_url = getattr(course, "image_url", None)
+    if asset_manifest is None or not image_url:
+        return course
+    return course.model_copy(update={"image_url": asset_manifest.original_url(image_url)})
+
+
+def _field_columns(fields: Optional[tuple]) -> Optional[List[str]]:
+    """Course columns behind a sparse fieldset (creator is a relationship, not a column)"""
+    if fields is None:
+        return None
+    return [name for name in fields if name != "creator"]
+
+
+def _page_body(items: list, **envelope) -> bytes:
+    """
+    Encode a listing page straight to JSON bytes in PaginatedResponse's shape.
+    Items are already plain dicts of validated column values, so neither they
+    nor the envelope are validated again.
+    """
+    return to_json({"items": items, **envelope})
+
+
+def _row_items(rows: list, keys: tuple) -> list:
+    """Plain dicts of the response keys from listing rows"""
+    return [_hashed_image({key: mapping[key] for key in keys}) for mapping in (row._mapping for row in rows)]
+
+
+def _course_validators(course: Course, fields: Optional[tuple] = None) -> CachedResponse:
+    """
+    ETag and Last-Modified of a single-course response, from its updated_at (and
+    its creator's) without serializing it. The body is left empty.
+    """
+    last_modified = course.updated_at
+    creator_updated_at = None
+    if (fields is None or "creator" in fields) and course.creator and course.creator.updated_at:
+        creator_updated_at = course.creator.updated_at
+        last_modified = max(last_modified, creator_updated_at)
+    etag = version_etag(_cache_key("course", course.id), course.updated_at, creator_updated_at, fields)
+    return CachedResponse(b"", etag, _http_date(last_modified))
+
+
+def _listing_etag(cache_key: str, courses: list, with_creator: bool, *envelope) -> str:
+    """
+    ETag of a listing page from the ids and updated_at of its courses (and
+    creators) plus the envelope, so unchanged pages are answered with a 304
+    before any item is serialized
+    """
+    versions = [
+        (course.id, course.updated_at, course.creator.updated_at if with_creator and course.creator else None)
+        for course in courses
+    ]
+    return version_etag(cache_key, versions, *envelope)
+
+
+def _cache_course(course: Course, fields: Optional[tuple] = None, generation: Optional[int] = None) -> CachedResponse:
+    """
+    Serialize a course (with its creator, or just `fields`) into its single-course cache entry.
+    Pass the cache generation read before loading the course, so a copy read
+    before a concurrent write is not cached after it.
+    """
+    item_schema = CourseWithCreator if fields is None else sparse_course_schema(fields)
+    body = _with_hashed_image(item_schema.model_validate(course)).model_dump_json().encode()
+    validators = _course_validators(course, fields)
+    cache_key = _cache_key("course", course.id, *([fields] if fields else []))
+    return crud.course_response_cache.set(
+        cache_key, body, last_modified=validators.last_modified, generation=generation, etag=validators.etag
+    )
+
+
+def course_filters(
     category: Optional[str] = Query(None, description="Filter by category"),
-    level: Optional[str] = Query(None, description="Filter by level"),
+    level: Optional[str] = Query(None, description="Filter by level (Beginner, Intermediate, Advanced)"),
     published: Optional[bool] = Query(None, description="Filter by published status"),
     search: Optional[str] = Query(None, description="Search in title and description"),
-    sort_by: str = Query("created_at", description="Sort by field"),
+    min_rating: Optional[float] = Query(None, ge=0, le=5, description="Minimum rating"),
+    max_rating: Optional[float] = Query(None, ge=0, le=5, description="Maximum rating"),
+    min_duration: Optional[float] = Query(None, gt=0, description="Minimum duration in hours"),
+    max_duration: Optional[float] = Query(None, gt=0, description="Maximum duration in hours"),
+    min_credits: Optional[int] = Query(None, ge=1, le=100, description="Minimum credits"),
+    max_credits: Optional[int] = Query(None, ge=1, le=100, description="Maximum credits")
+) -> CourseFilter:
+    """Listing filters shared by the course list, facets and export endpoints"""
+    # Blank values mean "no filter", as the frontend sends level=""
+    if level and level not in {member.value for member in CourseLevel}:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="level must be one of Beginner, Intermediate, Advanced"
+        )
+    return CourseFilter(
+        category=category or None,
+        level=level or None,
+        published=published,
+        search=search,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        min_duration=min_duration,
+        max_duration=max_duration,
+        min_credits=min_credits,
+        max_credits=max_credits
+    )
+
+
+@router.get("", response_model=PaginatedResponse)
+def get_courses(
+    request: Request,
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next_cursor (overrides page)"),
+    filters: CourseFilter = Depends(course_filters),
+    sort_by: str = Query("created_at", description="Sort by field (relevance ranks search matches)"),
     order: str = Query("desc", description="Sort order (asc, desc)"),
+    include_total: bool = Query(True, description="Compute total and total_pages"),
+    estimate_total: bool = Query(False, description="Use the planner's row estimate for unfiltered totals"),
+    expand: Optional[str] = Query(None, description="Related data to include (creator)"),
+    fields: Optional[tuple] = Depends(course_fields),
     db: Session = Depends(get_db)
 ):
-    """Get all courses with filtering, sorting, and pagination"""
-    skip = (page - 1) * limit
-    
-    courses, total = crud.get_courses(
-        db=db,
-        skip=skip,
-        limit=limit,
-        category=category,
-        level=level,
-        published=published,
-        search=search,
-        sort_by=sort_by,
-        order=order
+    """
+    Get all courses with filtering, sorting, and pagination.
+    Pass the returned next_cursor back as `cursor` for keyset pagination,
+    which costs the same for every page no matter how deep.
+    With `fields`, only those columns are selected and returned.
+    """
+    expansions = {part.strip() for part in expand.split(",")} if expand else set()
+    with_creator = "creator" in expansions or (fields is not None and "creator" in fields)
+    if with_creator and fields is not None and "creator" not in fields:
+        fields = fields + ("creator",)
+    sort_by = crud.resolve_sort_field(sort_by)
+    columns = _field_columns(fields)
+    # updated_at is always loaded for the ETag
+    if columns is not None:
+        columns = columns + ["updated_at"]
+    # Without creators, rows go straight from the cursor to JSON (see _page_body)
+    as_rows = not with_creator
+    
+    cache_key = _cache_key(
+        "list", page, limit, cursor, crud.filter_cache_key(filters), sort_by, order.lower(),
+        include_total, estimate_total, with_creator, fields
     )
+    cached = crud.course_response_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(request, cached)
+    generation = crud.course_response_cache.generation()
+
+    # Unfiltered totals can come from the planner instead of a COUNT(*)
+    total_estimated = False
+    estimated_total = None
+    if include_total and estimate_total and not crud.has_filters(filters):
+        estimated_total = crud.estimate_course_count(db)
+        total_estimated = estimated_total is not None
+    count_needed = include_total and not total_estimated
+
+    if cursor:
+        try:
+            courses, next_cursor = crud.get_courses_after(
+                db=db,
+                cursor=cursor,
+                limit=limit,
+                filters=filters,
+                sort_by=sort_by,
+                order=order,
+                with_creator=with_creator,
+                columns=columns,
+                as_rows=as_rows
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        total = None
+        if count_needed:
+            total = crud.count_courses(db=db, filters=filters)
+        page = None
+    else:
+        skip = (page - 1) * limit
+        
+        courses, total = crud.get_courses(
+            db=db,
+            skip=skip,
+            limit=limit,
+            filters=filters,
+            sort_by=sort_by,
+            order=order,
+            include_total=count_needed,
+            with_creator=with_creator,
+            columns=columns,
+            as_rows=as_rows
+        )
+        
+        # Hand out a cursor so clients can switch to keyset pagination
+        next_cursor = None
+        has_more = skip + len(courses) < total if total is not None else len(courses) == limit
+        if courses and sort_by in crud.VALID_SORT_FIELDS and has_more:
+            next_cursor = crud.encode_cursor(courses[-1], sort_by, order)
     
-    total_pages = math.ceil(total / limit) if total > 0 else 0
+    if total_estimated:
+        total = estimated_total
     
-   
-    courses_response = [CourseResponse.model_validate(course) for course in courses]
+    total_pages = None
+    if total is not None:
+        total_pages = math.ceil(total / limit) if total > 0 else 0
+    
+    # Revalidations of an unchanged page stop here, before serialization
+    etag = _listing_etag(cache_key, courses, with_creator, total, page, next_cursor, total_estimated)
+    if _not_modified(request, CachedResponse(b"", etag)):
+        return _json_response(request, CachedResponse(b"", etag))
+    
+    if as_rows:
+        items = _row_items(courses, fields or COURSE_RESPONSE_FIELDS)
+    else:
+        item_schema = CourseWithCreator if fields is None else sparse_course_schema(fields)
+        items = [_hashed_image(item_schema.model_validate(course).model_dump(mode="json")) for course in courses]
     
-    return PaginatedResponse(
-        items=courses_response,
+    body = _page_body(
+        items,
         total=total,
         page=page,
         page_size=limit,
-        total_pages=total_pages
+        total_pages=total_pages,
+        total_estimated=total_estimated,
+        next_cursor=next_cursor
+    )
+    entry = crud.course_response_cache.set(cache_key, body, generation=generation, etag=etag)
+    
+    return _json_response(request, entry)
+
+
+def _bulk_response(results: List[BulkItemResult], ok_status: str) -> BulkResponse:
+    """Summarize per-item bulk results"""
+    succeeded = sum(1 for result in results if result.status == ok_status)
+    return BulkResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+def _check_bulk_ownership(
+    db: Session,
+    course_ids: List[str],
+    user_id: str
+) -> tuple[List[BulkItemResult], List[int]]:
+    """
+    Resolve ownership for a batch of ids with one query.
+    Returns the failure results plus the indexes of the items the user may modify.
+    """
+    owners = crud.get_course_owners(db, course_ids)
+    failures, allowed = [], []
+    for index, course_id in enumerate(course_ids):
+        if course_id not in owners:
+            failures.append(BulkItemResult(index=index, id=course_id, status="not_found", detail="Course not found"))
+        elif owners[course_id] != user_id:
+            failures.append(BulkItemResult(index=index, id=course_id, status="forbidden", detail="You can only modify your own courses"))
+        else:
+            allowed.append(index)
+    return failures, allowed
+
+
+@router.get("/facets", response_model=FacetsResponse)
+def get_course_facets(
+    filters: CourseFilter = Depends(course_filters),
+    db: Session = Depends(get_db)
+):
+    """
+    Per-category, level and published counts plus rating and duration histograms
+    for the current filters, in a single request
+    """
+    return crud.get_course_facets(db, filters)
+
+
+@router.get("/export")
+def export_courses(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
+    filters: CourseFilter = Depends(course_filters),
+    sort_by: str = Query("created_at", description="Sort by field"),
+    order: str = Query("desc", description="Sort order (asc, desc)")
+):
+    """
+    Stream the whole (filtered) catalog as NDJSON or CSV
+    Rows come straight from a server-side cursor, so memory stays constant
+    """
+    def stream():
+        # The response outlives the request scope, so the stream owns its session
+        db = SessionLocal()
+        try:
+            rows = crud.iter_courses(
+                db,
+                filters=filters,
+                sort_by=sort_by,
+                order=order
+            )
+            yield from exporter.encode_rows(rows, format, compress=gzip)
+        finally:
+            db.close()
+    
+    filename = f"courses.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream(),
+        media_type="application/gzip" if gzip else exporter.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
+@router.post("/bulk", response_model=BulkResponse, status_code=status.HTTP_201_CREATED)
+def create_courses_bulk(
+    courses: List[CourseCreate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many courses in one transaction (requires authentication)
+    """
+    course_ids = crud.create_courses(db, [_with_original_image(course) for course in courses], user_id=current_user.id)
+    
+    results = [
+        BulkItemResult(index=index, id=course_id, status="created")
+        for index, course_id in enumerate(course_ids)
+    ]
+    return _bulk_response(results, "created")
+
+
+@router.put("/bulk", response_model=BulkResponse)
+def update_courses_bulk(
+    updates: List[CourseBulkUpdate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Update many courses in one transaction (requires authentication)
+    Items for missing courses or courses owned by someone else are skipped and reported
+    """
+    results, allowed = _check_bulk_ownership(db, [item.id for item in updates], current_user.id)
+    
+    if allowed:
+        crud.update_courses(db, [_with_original_image(updates[index]) for index in allowed])
+    results += [BulkItemResult(index=index, id=updates[index].id, status="updated") for index in allowed]
+    
+    results.sort(key=lambda result: result.index)
+    return _bulk_response(results, "updated")
+
+
+@router.post("/bulk/delete", response_model=BulkResponse)
+def delete_courses_bulk(
+    payload: CourseBulkDelete,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete many courses in one transaction (requires authentication)
+    Items for missing courses or courses owned by someone else are skipped and reported,
+    as are repeats of an id earlier in the list
+    """
+    # A repeated id is reported once as deleted, its repeats as duplicates
+    first_index = {}
+    duplicates = []
+    for index, course_id in enumerate(payload.ids):
+        if course_id in first_index:
+            duplicates.append(BulkItemResult(
+                index=index, id=course_id, status="duplicate",
+                detail=f"Same course as item {first_index[course_id]}"
+            ))
+        else:
+            first_index[course_id] = index
+    
+    unique_ids = list(first_index)
+    results, allowed = _check_bulk_ownership(db, unique_ids, current_user.id)
+    for result in results:
+        result.index = first_index[result.id]
+    
+    if allowed:
+        crud.delete_courses(db, [unique_ids[index] for index in allowed])
+    results += [BulkItemResult(index=first_index[unique_ids[index]], id=unique_ids[index], status="deleted") for index in allowed]
+    results += duplicates
+    
+    results.sort(key=lambda result: result.index)
+    return _bulk_response(results, "deleted")
+
+
+@router.post("/import", response_model=ImportReport)
+def import_courses(
+    file: UploadFile = File(..., description="NDJSON or CSV file of CourseCreate rows"),
+    format: Optional[str] = Query(None, description="ndjson or csv (detected from the file name if omitted)"),
+    batch_size: int = Query(crud.BULK_BATCH_SIZE, ge=1, le=10000, description="Rows per INSERT batch"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Import a course catalog file (requires authentication)
+    The upload is parsed and validated line by line and written in batches,
+    so memory use does not grow with file size. Invalid lines are skipped and reported.
+    """
+    fmt = format or importer.detect_format(file.filename, file.content_type)
+    if fmt not in importer.SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown import format, pass format=ndjson or format=csv"
+        )
+    
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return importer.import_courses(db, stream, fmt, user_id=current_user.id, batch_size=batch_size)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import files must be UTF-8 encoded"
+        )
+    finally:
+        stream.detach()
+
+
+def _batch_response(request: Request, course_ids: List[str], db: Session) -> Response:
+    """
+    Resolve many ids at once. Ids already in the course cache are served from it;
+    the rest are loaded with a single IN query and cached for later single or batch reads.
+    """
+    course_ids = list(dict.fromkeys(course_id.strip() for course_id in course_ids if course_id.strip()))
+    if not course_ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="At least one course id is required"
+        )
+    if len(course_ids) > BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BATCH_MAX_IDS} ids per request"
+        )
+
+    entries = {}
+    generation = crud.course_response_cache.generation()
+    for course_id in course_ids:
+        cached = crud.course_response_cache.get(_cache_key("course", course_id))
+        if cached is not None:
+            entries[course_id] = cached
+
+    misses = [course_id for course_id in course_ids if course_id not in entries]
+    if misses:
+        for course_id, course in crud.get_courses_by_ids(db, misses, with_creator=True).items():
+            entries[course_id] = _cache_course(course, generation=generation)
+
+    # Stitch the cached per-course JSON together instead of re-serializing each course
+    items = b",".join(entries[course_id].body for course_id in course_ids if course_id in entries)
+    missing = json.dumps([course_id for course_id in course_ids if course_id not in entries]).encode()
+    body = b'{"items":[' + items + b'],"missing":' + missing + b"}"
+    return _json_response(request, CachedResponse(body, compute_etag(body), None))
+
+
+@router.get("/batch", response_model=CourseBatchResponse)
+def get_courses_batch(
+    request: Request,
+    ids: str = Query(..., description="Comma-separated course ids"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get many courses by id in one request.
+    Found courses come back in request order; unknown ids are listed in `missing`.
+    """
+    return _batch_response(request, ids.split(","), db)
+
+
+@router.post("/batch", response_model=CourseBatchResponse)
+def post_courses_batch(request: Request, batch: CourseBatchRequest, db: Session = Depends(get_db)):
+    """
+    Same as GET /batch with the ids in the request body, for lists too long for a URL
+    """
+    return _batch_response(request, batch.ids, db)
+
+
 @router.get("/{course_id}", response_model=CourseWithCreator)
-async def get_course(course_id: str, db: Session = Depends(get_db)):
+def get_course(
+    request: Request,
+    course_id: str,
+    fields: Optional[tuple] = Depends(course_fields),
+    db: Session = Depends(get_db)
+):
     """
     Get a single course by ID
     """
-    course = crud.get_course_by_id(db, course_id=course_id)
+    cache_key = _cache_key("course", course_id, *([fields] if fields else []))
+    cached = crud.course_response_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(request, cached)
+    generation = crud.course_response_cache.generation()
+    
+    # updated_at is always loaded for Last-Modified
+    columns = _field_columns(fields)
+    course = crud.get_course_by_id(
+        db,
+        course_id=course_id,
+        with_creator=fields is None or "creator" in fields,
+        columns=None if columns is None else columns + ["updated_at"]
+    )
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
-   
-    return CourseWithCreator.model_validate(course)
+    
+    # A client revalidating an unchanged course gets its 304 without serialization
+    validators = _course_validators(course, fields)
+    if _not_modified(request, validators):
+        return _json_response(request, validators)
+    return _json_response(request, _cache_course(course, fields, generation))
 
 
 @router.post("", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
-async def create_course(
+def create_course(
     course: CourseCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -86,13 +635,13 @@ async def create_course(
     """
     Create a new course (requires authentication)
     """
-    new_course = crud.create_course(db=db, course=course, user_id=current_user.id)
+    new_course = crud.create_course(db=db, course=_with_original_image(course), user_id=current_user.id)
    
-    return CourseResponse.model_validate(new_course)
+    return _with_hashed_image(CourseResponse.model_validate(new_course))
 
 
 @router.put("/{course_id}", response_model=CourseResponse)
-async def update_course(
+def update_course(
     course_id: str,
     course_update: CourseUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -118,13 +667,13 @@ async def update_course(
         )
     
     # Update the course
-    updated_course = crud.update_course(db, db_course, course_update)
+    updated_course = crud.update_course(db, db_course, _with_original_image(course_update))
     
-    return CourseResponse.model_validate(updated_course)
+    return _with_hashed_image(CourseResponse.model_validate(updated_course))
 
 
 @router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_course(
+def delete_course(
     course_id: str,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -154,13 +703,26 @@ async def delete_course(
 
 
 @router.get("/user/my-courses", response_model=List[CourseResponse])
-async def get_my_courses(
+def get_my_courses(
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all courses created by the current user
     """
+    cache_key = _cache_key("mine", current_user.id)
+    cached = crud.course_response_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(request, cached)
+    generation = crud.course_response_cache.generation()
+    
     courses = crud.get_user_courses(db, user_id=current_user.id)
+    etag = _listing_etag(cache_key, courses, False)
+    if _not_modified(request, CachedResponse(b"", etag)):
+        return _json_response(request, CachedResponse(b"", etag))
+    
+    body = CourseList.dump_json([_with_hashed_image(CourseResponse.model_validate(course)) for course in courses])
+    entry = crud.course_response_cache.set(cache_key, body, generation=generation, etag=etag)
     
-    return [CourseResponse.model_validate(course) for course in courses]
\ No newline at end of file
+    return _json_response(request, entry)
@@ -0,0 +1,36 @@
+"""
+Debug Routes - runtime SQL profiling controls
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import Optional
+
+from app.profiling import query_profiler, token_matches
+from app.schemas import ProfilingUpdate
+
+router = APIRouter(prefix="/api/debug", tags=["Debug"])
+
+
+def require_profiling_token(x_profiling_token: Optional[str] = Header(None)) -> None:
+    """
+    Debug routes need `X-Profiling-Token: <PROFILING_TOKEN>`; without a configured
+    token they do not exist
+    """
+    if not token_matches(x_profiling_token):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+@router.get("/profiling", dependencies=[Depends(require_profiling_token)])
+async def get_profiling():
+    """
+    Current profiling settings and the most recent slow queries (with sampled plans)
+    """
+    return query_profiler.report()
+
+
+@router.put("/profiling", dependencies=[Depends(require_profiling_token)])
+async def update_profiling(update: ProfilingUpdate):
+    """
+    Turn profiling on/off or change the slow-query threshold and EXPLAIN sampling
+    rate, without a restart (applies to this worker process)
+    """
+    return query_profiler.configure(**update.model_dump())
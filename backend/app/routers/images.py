@@ -0,0 +1,83 @@
+"""
+Course Image Routes
+"""
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, RedirectResponse, Response
+from pathlib import Path
+from typing import Optional
+import os
+
+from app.images import FORMATS, IMAGE_WIDTHS, ImageService
+from app.static import ASSETS_DIR, IMMUTABLE_CACHE_CONTROL
+
+router = APIRouter(tags=["Images"])
+
+IMAGE_CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", ASSETS_DIR.parent / ".image-cache"))
+IMAGES_PREFIX = "/images"
+# Derivatives of plain (unhashed) asset names may change when the asset is replaced
+IMAGE_MAX_AGE = int(os.getenv("IMAGE_MAX_AGE", 3600))
+
+image_service = ImageService(ASSETS_DIR, IMAGE_CACHE_DIR)
+
+
+@router.get("/api/images/srcset")
+def get_srcset(src: str = Query(..., description="Asset URL, e.g. /assets/crd-2.png")):
+    """
+    srcset-ready derivative URLs for an asset, for use in <img srcset>
+    """
+    name = src.removeprefix("/assets/")
+    source, _ = image_service.resolve(name)
+    if source is None or not image_service.enabled:
+        return {"src": src, "srcset": None, "widths": []}
+    return {
+        "src": src,
+        "srcset": image_service.srcset(IMAGES_PREFIX, name),
+        "widths": list(IMAGE_WIDTHS)
+    }
+
+
+@router.get(IMAGES_PREFIX + "/{width}/{name:path}")
+async def get_image(
+    request: Request,
+    width: int,
+    name: str,
+    format: Optional[str] = Query(None, pattern="^(avif|webp|png|jpeg)$", description="Force an output format")
+):
+    """
+    A resized copy of /assets/{name}, at most `width` pixels wide (rounded up to a
+    configured bucket). Without `format` the best of AVIF/WebP the client accepts is used.
+    Rendering happens in a process pool, never on the event loop.
+    """
+    source, hashed = image_service.resolve(name)
+    if source is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+    if width < 1:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="width must be positive")
+    if not image_service.enabled:
+        # Pillow is not installed: fall back to the original
+        return RedirectResponse(f"/assets/{name}", status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    output_format = image_service.negotiate(source, request.headers.get("accept", ""), format)
+    if output_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Format {format} is not supported by this server"
+        )
+
+    try:
+        path = await image_service.derivative(source, width, output_format)
+    except Exception as e:
+        print(f"Warning: could not render {name} at {width}px as {output_format}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Image could not be processed"
+        )
+
+    cache_control = IMMUTABLE_CACHE_CONTROL if hashed else f"public, max-age={IMAGE_MAX_AGE}"
+    headers = {"Cache-Control": cache_control}
+    if format is None:
+        headers["Vary"] = "Accept"
+    response = FileResponse(path, stat_result=os.stat(path), media_type=FORMATS[output_format][1], headers=headers)
+    if request.headers.get("if-none-match") == response.headers["etag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**headers, "ETag": response.headers["etag"]})
+    return response
@@ -11,7 +11,7 @@ from app.schemas import UserCreate, UserResponse, UserUpdate, Token, LoginReques
 from app.models import User
 from app import crud
 from app.auth import (
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     get_current_active_user,
     ACCESS_TOKEN_EXPIRE_MINUTES
@@ -20,8 +20,25 @@ from app.auth import (
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
+def authenticate_user(db: Session, username: str, password: str):
+    """
+    Return the user if the password matches, else None.
+    Hashes made with outdated settings are upgraded transparently.
+    """
+    user = crud.get_user_by_username(db, username=username)
+    if not user:
+        return None
+    
+    verified, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not verified:
+        return None
+    if new_hash:
+        crud.update_user_password_hash(db, user, new_hash)
+    return user
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+def register(user: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user
     """
@@ -47,15 +64,13 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     """
     Login and get access token (JWT)
     """
-    # Get user by username
-    user = crud.get_user_by_username(db, username=login_data.username)
-    
-    # Verify user exists and password is correct
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    # Get user by username and verify the password
+    user = authenticate_user(db, login_data.username, login_data.password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -79,16 +94,16 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/token", response_model=Token)
-async def login_with_form(
+def login_with_form(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     """
     OAuth2 compatible token login (for Swagger UI)
     """
-    user = crud.get_user_by_username(db, username=form_data.username)
+    user = authenticate_user(db, form_data.username, form_data.password)
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -112,7 +127,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
 
 
 @router.put("/profile", response_model=UserResponse)
-async def update_profile(
+def update_profile(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
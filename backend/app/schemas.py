@@ -1,10 +1,12 @@
 """
 Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, SerializeAsAny, create_model, model_validator, validator
+from typing import Optional, List, Union
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+import os
 
 
 # Enums for validation
@@ -94,6 +96,14 @@ class CourseUpdate(BaseModel):
             return round(v, 1)
         return v
 
+    @model_validator(mode="after")
+    def reject_explicit_nulls(self):
+        # Omit a field to leave it unchanged; every course column is required
+        nulls = sorted(name for name in self.model_fields_set if getattr(self, name) is None)
+        if nulls:
+            raise ValueError(f"Fields cannot be null: {', '.join(nulls)}")
+        return self
+
 
 class CourseResponse(CourseBase):
     id: str
@@ -112,6 +122,78 @@ class CourseWithCreator(CourseResponse):
         from_attributes = True
 
 
+# Fields a client may request with `fields=`; id is always included
+COURSE_FIELDS = tuple(CourseWithCreator.model_fields)
+COURSE_RESPONSE_FIELDS = tuple(CourseResponse.model_fields)
+
+
+@lru_cache(maxsize=128)
+def sparse_course_schema(fields: tuple) -> type:
+    """
+    Response model with only the given CourseWithCreator fields (sparse fieldsets).
+    Values are read from attributes as-is; they were validated when the course was written.
+    """
+    definitions = {name: (CourseWithCreator.model_fields[name].annotation, None) for name in fields}
+    return create_model("CourseFields", __config__=ConfigDict(from_attributes=True), **definitions)
+
+
+# Bulk Schemas
+# Upper bound on items per bulk create/update/delete request
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 1000))
+
+
+class CourseBulkUpdate(CourseUpdate):
+    id: str
+
+
+class CourseBulkDelete(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str = Field(..., description="created, updated, deleted, duplicate, not_found or forbidden")
+    detail: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+# Batch Read Schemas
+class CourseBatchRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+
+
+class CourseBatchResponse(BaseModel):
+    items: List[CourseWithCreator] = Field(..., description="Found courses in request order")
+    missing: List[str] = Field(default_factory=list, description="Requested ids that do not exist")
+
+
+# Debug Schemas
+class ProfilingUpdate(BaseModel):
+    enabled: Optional[bool] = None
+    slow_query_ms: Optional[float] = Field(None, ge=0)
+    explain_sample_rate: Optional[float] = Field(None, ge=0, le=1)
+
+
+# Import Schemas
+class ImportLineError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportLineError] = []
+    errors_truncated: bool = False
+
+
 # Authentication Schemas
 class Token(BaseModel):
     access_token: str
@@ -129,16 +211,34 @@ class LoginRequest(BaseModel):
 
 # Pagination Schema
 class PaginatedResponse(BaseModel):
-    items: List[CourseResponse]  
-    total: int
-    page: int
+    # SerializeAsAny keeps the creator on CourseWithCreator items (expand=creator)
+    items: List[SerializeAsAny[CourseResponse]]
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    total_estimated: bool = False
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, null on the last page")
 
     class Config:
         from_attributes = True
 
 
+# Facet Schemas
+class FacetCount(BaseModel):
+    value: Optional[Union[bool, str]]
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    total: int
+    category: List[FacetCount]
+    level: List[FacetCount]
+    published: List[FacetCount]
+    rating: List[FacetCount] = Field(..., description="Rating histogram, buckets are [lower, upper)")
+    duration: List[FacetCount] = Field(..., description="Duration (hours) histogram, buckets are [lower, upper)")
+
+
 # Filter Schema for Course Search
 class CourseFilter(BaseModel):
     category: Optional[str] = None
@@ -146,4 +246,8 @@ class CourseFilter(BaseModel):
     published: Optional[bool] = None
     search: Optional[str] = Field(None, description="Search in title and description")
     min_rating: Optional[float] = Field(None, ge=0, le=5)
-    max_duration: Optional[float] = Field(None, gt=0)
\ No newline at end of file
+    max_rating: Optional[float] = Field(None, ge=0, le=5)
+    min_duration: Optional[float] = Field(None, gt=0)
+    max_duration: Optional[float] = Field(None, gt=0)
+    min_credits: Optional[int] = Field(None, ge=1, le=100)
+    max_credits: Optional[int] = Field(None, ge=1, le=100)
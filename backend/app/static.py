@@ -0,0 +1,232 @@
+"""
+Static asset pipeline: content-hashed URLs and precompressed variants
+
+build_assets() hashes every file under the assets directory and writes .gz
+(and .br when the brotli package is installed) variants into a build directory,
+keyed by content hash so unchanged files are never recompressed.
+AssetStaticFiles serves `/assets/<name>.<hash>.<ext>` with immutable cache
+headers and picks a precompressed variant from Accept-Encoding, so no
+compression happens per request.
+
+Build ahead of deploys with `python -m app.static`; the app also builds on
+startup, which is a no-op when the variants already exist, and rebuilds the
+manifest when files change (checked every ASSET_RESCAN_INTERVAL seconds).
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+
+import anyio
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.compression import accepted_encodings, brotli, is_compressible
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ASSETS_DIR = BASE_DIR / "assets"
+ASSET_BUILD_DIR = Path(os.getenv("ASSET_BUILD_DIR", BASE_DIR / ".asset-build"))
+
+# How often (seconds) the assets directory is checked for changes
+ASSET_RESCAN_INTERVAL = float(os.getenv("ASSET_RESCAN_INTERVAL", 10))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+# Keep a variant only if it is at least this much smaller than the original
+MIN_SAVINGS = 0.1
+MANIFEST_NAME = "manifest.json"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=6).hexdigest()
+
+
+def hashed_name(name: str, digest: str) -> str:
+    """card-image.png -> card-image.<digest>.png"""
+    path = Path(name)
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix())
+
+
+@dataclass
+class AssetManifest:
+    """Original asset name -> content hash, hashed name and precompressed variants"""
+    assets: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._by_hashed_name = {entry["hashed"]: name for name, entry in self.assets.items()}
+        # Changes whenever any asset does; part of cache keys for responses that embed hashed URLs
+        self.version = content_hash(json.dumps(sorted(entry["hashed"] for entry in self.assets.values())).encode())
+
+    def update(self, other: "AssetManifest") -> None:
+        """Take over another manifest's contents, so existing references see the change"""
+        self.assets = other.assets
+        self._by_hashed_name = other._by_hashed_name
+        self.version = other.version
+
+    def resolve(self, path: str) -> tuple[Optional[str], bool]:
+        """Map a request path to (original asset name, is a hashed URL)"""
+        if path in self._by_hashed_name:
+            return self._by_hashed_name[path], True
+        if path in self.assets:
+            return path, False
+        return None, False
+
+    def url(self, name: str, prefix: str = "/assets") -> str:
+        """Content-hashed URL for an asset (the plain URL if it is unknown)"""
+        entry = self.assets.get(name)
+        return f"{prefix}/{entry['hashed'] if entry else name}"
+
+    def hashed_url(self, url: str, prefix: str = "/assets") -> str:
+        """Rewrite a plain `/assets/<name>` URL to its hashed URL; other URLs are returned unchanged"""
+        if not url or not url.startswith(prefix + "/"):
+            return url
+        return self.url(url[len(prefix) + 1:], prefix)
+
+    def original_url(self, url: str, prefix: str = "/assets") -> str:
+        """Inverse of hashed_url, for hashed URLs that clients send back"""
+        if not url or not url.startswith(prefix + "/"):
+            return url
+        name, hashed = self.resolve(url[len(prefix) + 1:])
+        return f"{prefix}/{name}" if hashed else url
+
+    def to_dict(self) -> dict:
+        return {"assets": self.assets}
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def directory_signature(assets_dir: Path) -> tuple:
+    """(path, size, mtime) of every asset; changes whenever a file is added, removed or rewritten"""
+    signature = []
+    for root, _, files in os.walk(assets_dir):
+        for file_name in files:
+            stat = os.stat(os.path.join(root, file_name))
+            signature.append((os.path.join(root, file_name), stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(signature))
+
+
+def build_assets(assets_dir: Path, build_dir: Path) -> AssetManifest:
+    """
+    Hash every asset and write missing precompressed variants into build_dir.
+    Variants are named by content hash, so repeated builds only touch changed files.
+    """
+    build_dir.mkdir(parents=True, exist_ok=True)
+    encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+    assets = {}
+
+    for path in sorted(assets_dir.rglob("*")):
+        if not path.is_file() or path.name.startswith("."):
+            continue
+        name = path.relative_to(assets_dir).as_posix()
+        data = path.read_bytes()
+        digest = content_hash(data)
+        entry = {"hash": digest, "hashed": hashed_name(name, digest), "size": len(data), "encodings": {}}
+
+        content_type, _ = mimetypes.guess_type(name)
+        if is_compressible(content_type):
+            for encoding in encodings:
+                suffix = ".br" if encoding == "br" else ".gz"
+                variant = build_dir / f"{digest}{suffix}"
+                if not variant.exists():
+                    compressed = _compress(data, encoding)
+                    if len(compressed) > len(data) * (1 - MIN_SAVINGS):
+                        continue
+                    variant.write_bytes(compressed)
+                entry["encodings"][encoding] = variant.name
+        assets[name] = entry
+
+    manifest = AssetManifest(assets)
+    (build_dir / MANIFEST_NAME).write_text(json.dumps(manifest.to_dict(), indent=2))
+    return manifest
+
+
+class AssetStaticFiles(StaticFiles):
+    """
+    StaticFiles that understands the asset manifest.
+    Hashed URLs are cached as immutable; plain URLs revalidate with their ETag.
+    Compressible files are served from their precompressed variant when accepted.
+    """
+
+    def __init__(self, *, directory: Path, build_dir: Path, **kwargs):
+        super().__init__(directory=str(directory), **kwargs)
+        self.assets_dir = Path(directory)
+        self.build_dir = build_dir
+        self._lock = threading.Lock()
+        self._signature = directory_signature(self.assets_dir)
+        self._checked_at = time.monotonic()
+        self.manifest = build_assets(self.assets_dir, build_dir)
+
+    def refresh_due(self) -> bool:
+        return time.monotonic() - self._checked_at >= ASSET_RESCAN_INTERVAL
+
+    def refresh(self) -> AssetManifest:
+        """
+        Rebuild the manifest in place if the assets changed since the last check.
+        Blocking (stats and hashes files); call it from a worker thread.
+        """
+        with self._lock:
+            if not self.refresh_due():
+                return self.manifest
+            self._checked_at = time.monotonic()
+            signature = directory_signature(self.assets_dir)
+            if signature != self._signature:
+                self.manifest.update(build_assets(self.assets_dir, self.build_dir))
+                self._signature = signature
+        return self.manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if self.refresh_due():
+            await anyio.to_thread.run_sync(self.refresh)
+        name, immutable = self.manifest.resolve(Path(path).as_posix())
+        if name is None:
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        entry = self.manifest.assets[name]
+        cache_control = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        accepted = accepted_encodings(request_headers)
+
+        for encoding in ("br", "gzip"):
+            variant = entry["encodings"].get(encoding)
+            if variant and encoding in accepted:
+                variant_path = self.build_dir / variant
+                response = FileResponse(
+                    variant_path,
+                    stat_result=os.stat(variant_path),
+                    media_type=mimetypes.guess_type(name)[0],
+                    headers={
+                        "Content-Encoding": encoding,
+                        "Vary": "Accept-Encoding",
+                        "Cache-Control": cache_control,
+                    },
+                )
+                if self.is_not_modified(response.headers, request_headers):
+                    return NotModifiedResponse(response.headers)
+                return response
+
+        response = await super().get_response(name, scope)
+        response.headers["Cache-Control"] = cache_control
+        if entry["encodings"]:
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+if __name__ == "__main__":
+    built = build_assets(ASSETS_DIR, ASSET_BUILD_DIR)
+    for asset_name, asset in built.assets.items():
+        variants = ", ".join(asset["encodings"]) or "none"
+        print(f"{asset_name} -> {asset['hashed']} (precompressed: {variants})")
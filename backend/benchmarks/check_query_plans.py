@@ -0,0 +1,30 @@
+"""
+Query plan regression check against a dedicated database, e.g. PostgreSQL
+
+The checks live in tests/test_query_plans.py and run against a throwaway
+SQLite database with the rest of the test suite; this runs the same checks
+against TEST_DATABASE_URL instead. Exits non-zero if any hot combination
+falls back to a full table scan or a sort step.
+
+Usage:
+    TEST_DATABASE_URL=postgresql://... python benchmarks/check_query_plans.py
+"""
+from pathlib import Path
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def main() -> int:
+    if not os.getenv("TEST_DATABASE_URL"):
+        print("Set TEST_DATABASE_URL to the database to check (it gets the app's tables if missing)")
+        return 2
+    sys.path.insert(0, str(BACKEND_DIR))
+    return int(pytest.main(["-q", str(BACKEND_DIR / "tests" / "test_query_plans.py")]))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Concurrent request throughput benchmark
+
+Fires requests at a running API from a pool of client threads and reports
+throughput and latency percentiles. With --background-url, a second pool keeps
+slow requests in flight meanwhile, which shows whether a slow query in one
+request stalls the others.
+
+Usage:
+    uvicorn app.main:app --port 8000
+    python benchmarks/concurrent_requests.py --url http://localhost:8000/api/courses --concurrency 32 --requests 2000
+    python benchmarks/concurrent_requests.py --url http://localhost:8000/api/courses/<id> \
+        --background-url "http://localhost:8000/api/courses?search=python&page=500"
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a sorted sample list"""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, round(pct / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+def fetch(url: str, timeout: float) -> tuple[float, int]:
+    """Issue one GET and return (latency seconds, status code)"""
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return time.perf_counter() - start, status
+
+
+def background_load(url: str, workers: int, timeout: float, stop: threading.Event) -> None:
+    """Keep `workers` requests to url in flight until stop is set"""
+    def loop():
+        while not stop.is_set():
+            fetch(url, timeout)
+
+    for _ in range(workers):
+        threading.Thread(target=loop, daemon=True).start()
+
+
+def run(url: str, concurrency: int, requests: int, timeout: float,
+        background_url: str = None, background_workers: int = 4) -> dict:
+    """Run the benchmark and return a summary"""
+    stop = threading.Event()
+    if background_url:
+        background_load(background_url, background_workers, timeout, stop)
+        time.sleep(0.5)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: fetch(url, timeout), range(requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, status in results if status != 200)
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "background_url": background_url,
+        "requests": requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 2),
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/api/courses")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--background-url", default=None, help="Slow request kept in flight during the run")
+    parser.add_argument("--background-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    summary = run(
+        args.url, args.concurrency, args.requests, args.timeout,
+        args.background_url, args.background_workers
+    )
+    print(json.dumps(summary, indent=2))
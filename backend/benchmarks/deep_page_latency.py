@@ -0,0 +1,143 @@
+"""
+Sorted deep-page latency benchmark
+
+Times one listing page at increasing depths for each sort, comparing OFFSET
+paging (page=N) with keyset paging (cursor) at the same position. With
+--check-stability it also walks every cursor page of each sort and fails if a
+course is repeated or skipped, which catches orderings without a unique
+tiebreaker.
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmarks/deep_page_latency.py --seed 100000
+    python benchmarks/deep_page_latency.py --sorts rating credits --depths 1 100 1000 --check-stability
+"""
+from pathlib import Path
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import crud  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.schemas import CourseCreate  # noqa: E402
+
+CATEGORIES = ["Information Technology", "Business", "Design", "Science", "Health"]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+
+def seed(db, count: int) -> None:
+    """Insert synthetic courses; ratings and credits repeat heavily so ties are common"""
+    courses = [
+        CourseCreate(
+            title=f"Benchmark course {i}",
+            description="Synthetic course for the deep-page benchmark",
+            category=random.choice(CATEGORIES),
+            level=random.choice(LEVELS),
+            duration=random.randint(1, 80),
+            credits=random.choice([10, 20, 40, 60, 80]),
+            rating=random.choice([3.5, 4.0, 4.5, 5.0])
+        )
+        for i in range(count)
+    ]
+    for batch in crud._batches(courses, 5000):
+        crud.create_courses(db, batch, None)
+
+
+def time_call(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def measure(db, sort_by: str, order: str, page: int, limit: int, repeat: int) -> dict:
+    """Time the same page through OFFSET and through a cursor"""
+    skip = (page - 1) * limit
+    offset_ms = time_call(
+        lambda: crud.get_courses(db, skip=skip, limit=limit, sort_by=sort_by, order=order, include_total=False),
+        repeat
+    )
+    result = {"sort_by": sort_by, "order": order, "page": page, "offset_ms": round(offset_ms, 2), "cursor_ms": None}
+
+    if skip:
+        # Position the cursor on the last row of the previous page (untimed)
+        previous, _ = crud.get_courses(db, skip=skip - 1, limit=1, sort_by=sort_by, order=order, include_total=False)
+        if previous:
+            cursor = crud.encode_cursor(previous[0], sort_by, order)
+            cursor_ms = time_call(
+                lambda: crud.get_courses_after(db, cursor=cursor, limit=limit, sort_by=sort_by, order=order),
+                repeat
+            )
+            result["cursor_ms"] = round(cursor_ms, 2)
+    return result
+
+
+def check_stability(db, sort_by: str, order: str, limit: int) -> bool:
+    """Walk every cursor page and confirm each course appears exactly once"""
+    seen = set()
+    duplicates = 0
+    cursor = None
+    while True:
+        courses, cursor = crud.get_courses_after(db, cursor=cursor, limit=limit, sort_by=sort_by, order=order)
+        for course in courses:
+            duplicates += course.id in seen
+            seen.add(course.id)
+        db.expunge_all()
+        if cursor is None:
+            break
+    total = crud.count_courses(db)
+    ok = duplicates == 0 and len(seen) == total
+    print(f"  stability {sort_by} {order}: {len(seen)}/{total} courses, {duplicates} duplicates -> {'ok' if ok else 'FAIL'}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic courses first")
+    parser.add_argument("--sorts", nargs="+", default=["created_at", "rating", "credits"])
+    parser.add_argument("--order", default="desc")
+    parser.add_argument("--depths", nargs="+", type=int, default=[1, 10, 100, 1000], help="Page numbers to time")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check-stability", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if args.seed:
+            seed(db, args.seed)
+
+        results = []
+        for sort_by in args.sorts:
+            for page in args.depths:
+                results.append(measure(db, sort_by, args.order, page, args.limit, args.repeat))
+                db.expunge_all()
+
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            print(f"{'sort':<12} {'page':>6} {'offset ms':>10} {'cursor ms':>10}")
+            for row in results:
+                cursor_ms = "-" if row["cursor_ms"] is None else f"{row['cursor_ms']:.2f}"
+                print(f"{row['sort_by']:<12} {row['page']:>6} {row['offset_ms']:>10.2f} {cursor_ms:>10}")
+
+        stable = True
+        if args.check_stability:
+            for sort_by in args.sorts:
+                stable = check_stability(db, sort_by, args.order, args.limit) and stable
+    finally:
+        db.close()
+    return 0 if stable else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
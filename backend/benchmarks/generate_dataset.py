@@ -0,0 +1,160 @@
+"""
+Benchmark dataset generator
+
+Scales the seed_data.py sample catalog up to 10k, 100k or 1M courses (or any
+count), deterministically: the same --size and --seed always produce the same
+ids, titles, ratings and timestamps, so results from different commits are
+comparable. Also creates the `bench` user that the load-test suite logs in as.
+
+Rows are inserted with Core executemany in chunks, the facet summary table is
+recounted, and the tables are ANALYZEd afterwards so the planner sees
+realistic statistics.
+
+Usage:
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/generate_dataset.py --size 100k --reset
+    DATABASE_URL=postgresql://localhost/course_bench python benchmarks/generate_dataset.py --size 1m --reset
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, insert, select, text  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.auth import get_password_hash  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import Course, User  # noqa: E402
+from seed_data import SAMPLE_COURSES  # noqa: E402
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+CREDITS = [20, 30, 37, 40, 42, 45, 48, 50, 52, 55, 60]
+COHORTS = ["Online", "Evening", "Weekend", "Fast Track", "Part Time", "Full Time", "Blended", "Intensive"]
+
+BENCH_USERNAME = "bench"
+BENCH_PASSWORD = "bench-password"
+CREATORS = 50
+CHUNK_SIZE = 10_000
+# Fixed reference time, so created_at values do not depend on when the dataset was built
+EPOCH = datetime(2025, 1, 1)
+
+
+def parse_size(value: str) -> int:
+    return SIZES.get(value.lower()) or int(value.replace("_", ""))
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def make_users(rng: random.Random) -> list[dict]:
+    """The bench user plus the creators the courses are spread across (same hash, it is slow)"""
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    users = []
+    for index in range(CREATORS + 1):
+        username = BENCH_USERNAME if index == 0 else f"creator{index}"
+        users.append({
+            "id": _uuid(rng),
+            "username": username,
+            "email": f"{username}@bench.example.com",
+            "full_name": f"Benchmark {username}",
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "created_at": EPOCH,
+            "updated_at": EPOCH,
+        })
+    return users
+
+
+def make_courses(rng: random.Random, count: int, creator_ids: list[str]):
+    """Yield course rows derived from the sample catalog, with varied levels, ratings and dates"""
+    for index in range(count):
+        template = SAMPLE_COURSES[index % len(SAMPLE_COURSES)]
+        created_at = EPOCH - timedelta(seconds=rng.randrange(3 * 365 * 24 * 3600))
+        yield {
+            "id": _uuid(rng),
+            "title": f"{template['title']} - {rng.choice(COHORTS)} {index // len(SAMPLE_COURSES) + 1}",
+            "description": template["description"],
+            "category": template["category"],
+            "level": rng.choice(LEVELS),
+            "duration": round(max(0.5, template["duration"] + rng.uniform(-2, 2)), 1),
+            "credits": rng.choice(CREDITS),
+            "rating": round(min(5.0, max(1.0, template["rating"] + rng.uniform(-1.5, 0.5))), 1),
+            "duration_text": template.get("duration_text", "1 Year"),
+            "image_url": template.get("image_url", "/assets/card-image.png"),
+            # Same share of unpublished courses as seed_data.py
+            "published": index % 5 != 0,
+            "created_by": creator_ids[index % len(creator_ids)],
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def _chunks(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate(count: int, seed: int, reset: bool) -> dict:
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.connect() as connection:
+        existing = connection.execute(select(func.count()).select_from(Course)).scalar_one()
+    if existing:
+        raise SystemExit(f"Database already contains {existing} courses; pass --reset to rebuild it")
+
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    users = make_users(rng)
+    with engine.begin() as connection:
+        connection.execute(insert(User), users)
+
+    inserted = 0
+    creator_ids = [user["id"] for user in users[1:]]
+    for chunk in _chunks(make_courses(rng, count, creator_ids), CHUNK_SIZE):
+        with engine.begin() as connection:
+            connection.execute(insert(Course), chunk)
+        inserted += len(chunk)
+        print(f"  {inserted}/{count} courses", file=sys.stderr)
+
+    # Core inserts bypass the crud write paths that maintain the facet summary
+    with SessionLocal() as db:
+        crud.rebuild_facet_summary(db)
+
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+    elapsed = time.perf_counter() - start
+    return {
+        "courses": inserted,
+        "users": len(users),
+        "seed": seed,
+        "dialect": engine.dialect.name,
+        "elapsed_s": round(elapsed, 1),
+        "rows_per_s": round(inserted / elapsed),
+        "login": {"username": BENCH_USERNAME, "password": BENCH_PASSWORD},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=parse_size, default=SIZES["10k"], help="10k, 100k, 1m or a course count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate the tables first")
+    args = parser.parse_args()
+
+    print(json.dumps(generate(args.size, args.seed, args.reset), indent=2))
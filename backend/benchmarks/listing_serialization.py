@@ -0,0 +1,98 @@
+"""
+Listing serialization microbenchmark
+
+Measures per-request CPU time to fetch and encode one /api/courses page
+(100 items by default) through two paths:
+
+    models  ORM objects -> CourseResponse.model_validate per item ->
+            PaginatedResponse -> model_dump_json (the original handler)
+    rows    Row tuples -> plain dicts -> pydantic_core.to_json (the fast path)
+
+Both paths must produce the same JSON, which is checked before timing.
+
+Usage:
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/listing_serialization.py --seed 1000
+    python benchmarks/listing_serialization.py --limit 100 --iterations 500
+"""
+from pathlib import Path
+import argparse
+import json
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import crud  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.routers.courses import _page_body, _row_items  # noqa: E402
+from app.schemas import COURSE_RESPONSE_FIELDS, CourseCreate, CourseResponse, PaginatedResponse  # noqa: E402
+
+
+def models_path(db, limit: int) -> bytes:
+    courses, total = crud.get_courses(db, limit=limit, include_total=False)
+    items = [CourseResponse.model_validate(course) for course in courses]
+    body = PaginatedResponse(items=items, total=total, page=1, page_size=limit).model_dump_json().encode()
+    db.expunge_all()
+    return body
+
+
+def rows_path(db, limit: int) -> bytes:
+    rows, total = crud.get_courses(db, limit=limit, include_total=False, as_rows=True)
+    return _page_body(
+        _row_items(rows, COURSE_RESPONSE_FIELDS),
+        total=total, page=1, page_size=limit, total_pages=None, total_estimated=False, next_cursor=None
+    )
+
+
+def cpu_per_call(fn, iterations: int) -> list:
+    """CPU milliseconds of each call (process time, so waiting on the DB is excluded)"""
+    samples = []
+    for _ in range(iterations):
+        start = time.process_time()
+        fn()
+        samples.append((time.process_time() - start) * 1000)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic courses first")
+    parser.add_argument("--limit", type=int, default=100, help="Items per page")
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if args.seed:
+            crud.create_courses(db, [
+                CourseCreate(
+                    title=f"Serialization course {i}",
+                    description="Synthetic course for the serialization benchmark " * 8,
+                    category="Information Technology",
+                    level="Beginner",
+                    duration=12
+                )
+                for i in range(args.seed)
+            ], None)
+
+        if json.loads(models_path(db, args.limit)) != json.loads(rows_path(db, args.limit)):
+            print("models and rows paths produce different JSON")
+            return 1
+
+        print(f"{'path':<8} {'mean ms':>9} {'median ms':>10} {'p95 ms':>8}")
+        results = {}
+        for name, fn in (("models", models_path), ("rows", rows_path)):
+            samples = sorted(cpu_per_call(lambda: fn(db, args.limit), args.iterations))
+            results[name] = statistics.mean(samples)
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            print(f"{name:<8} {statistics.mean(samples):>9.3f} {statistics.median(samples):>10.3f} {p95:>8.3f}")
+        print(f"\nrows path uses {results['rows'] / results['models']:.0%} of the CPU per {args.limit}-item page")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
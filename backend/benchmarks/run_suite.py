@@ -0,0 +1,495 @@
+"""
+API load-test suite
+
+Runs a fixed set of scenarios against the API and reports latency percentiles
+(p50/p95/p99) and throughput per scenario as JSON, so runs on different
+commits can be compared and regressions fail the build:
+
+    list_filters    GET /api/courses with category/level/rating filters and sorts
+    deep_offset     GET /api/courses?page=N far into the listing (OFFSET paging)
+    deep_cursor     GET /api/courses?cursor=... at the same depths (keyset paging)
+    search          GET /api/courses?search=...
+    get_course      GET /api/courses/{id}
+    login           POST /api/auth/login (dominated by password hashing)
+    create_course   POST /api/courses, authenticated
+    update_course   PUT /api/courses/{id}, authenticated
+
+Request parameters are drawn from a seeded RNG before each scenario is timed,
+so two runs against the same dataset send the same requests. Courses created
+by the write scenarios are deleted at the end.
+
+The scenarios replay a small set of URLs, so with the response and count
+caches on nearly every timed read would be a cache hit and query regressions
+would not show. --serve and --in-process therefore run the app with both
+caches disabled (RESPONSE_CACHE_TTL=0, COURSE_COUNT_CACHE_TTL=0) unless
+--with-cache is given. Against an already running --url the server's own
+settings apply. The mode is recorded in the results' meta.
+
+Usage:
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/generate_dataset.py --size 100k --reset
+    # Starts uvicorn on --url's port with the caches off and stops it afterwards
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/run_suite.py --serve --output bench-main.json
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/run_suite.py --serve --baseline bench-main.json --max-regression 0.2
+    python benchmarks/run_suite.py --compare bench-main.json bench-branch.json
+
+    # Against a server you started yourself (its cache settings apply)
+    python benchmarks/run_suite.py --url http://localhost:8000 --output bench-main.json
+
+    # Without a server: requests go through the ASGI app in this process, one at a time
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/run_suite.py --in-process --scenarios list_filters get_course
+"""
+from pathlib import Path
+from typing import Callable, Optional
+import argparse
+import gzip
+import http.client
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from concurrent_requests import percentile
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# The user benchmarks/generate_dataset.py creates
+BENCH_USERNAME = "bench"
+BENCH_PASSWORD = "bench-password"
+
+SEARCH_TERMS = ["management", "computing", "health", "business", "network", "education", "finance", "leadership"]
+SORTS = ["created_at", "title", "rating", "credits", "duration"]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+# Turns off the response and count caches (a TTL of 0 disables them)
+CACHE_DISABLED_ENV = {"RESPONSE_CACHE_TTL": "0", "COURSE_COUNT_CACHE_TTL": "0"}
+SERVER_START_TIMEOUT = 60
+
+# Metrics compared against a baseline; higher is worse unless listed in HIGHER_IS_BETTER
+COMPARED_METRICS = ("p50", "p95", "throughput_rps")
+HIGHER_IS_BETTER = {"throughput_rps"}
+
+
+class HTTPClient:
+    """Keep-alive HTTP client with one connection per thread"""
+
+    def __init__(self, base_url: str, timeout: float):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.host = parsed.netloc
+        self.https = parsed.scheme == "https"
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            connection = self._local.connection = connection_class(self.host, timeout=self.timeout)
+        return connection
+
+    def request(self, method: str, path: str, body: Optional[dict] = None,
+                headers: Optional[dict] = None) -> tuple[int, bytes]:
+        headers = {"Accept-Encoding": "gzip", **(headers or {})}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        try:
+            connection = self._connection()
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            content = response.read()
+            if response.getheader("Content-Encoding") == "gzip":
+                content = gzip.decompress(content)
+            return response.status, content
+        except (OSError, http.client.HTTPException):
+            # Drop the broken connection; the next request on this thread reconnects
+            self._local.connection = None
+            return 0, b""
+
+
+class InProcessClient:
+    """Sends requests through the ASGI app with Starlette's TestClient (no network, no concurrency)"""
+
+    def __init__(self):
+        sys.path.insert(0, str(BACKEND_DIR))
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        self._client = TestClient(app)
+
+    def request(self, method: str, path: str, body: Optional[dict] = None,
+                headers: Optional[dict] = None) -> tuple[int, bytes]:
+        response = self._client.request(method, path, json=body, headers=headers)
+        return response.status_code, response.content
+
+
+def start_server(base_url: str, with_cache: bool) -> subprocess.Popen:
+    """Run uvicorn for the app on base_url's port and wait until it answers"""
+    parsed = urllib.parse.urlsplit(base_url)
+    env = dict(os.environ) if with_cache else {**os.environ, **CACHE_DISABLED_ENV}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", parsed.hostname,
+         "--port", str(parsed.port or 80), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env
+    )
+    client = HTTPClient(base_url, timeout=2)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"Server exited with status {server.returncode}")
+        if client.request("GET", "/api/health/live")[0] == 200:
+            return server
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit(f"Server did not answer within {SERVER_START_TIMEOUT}s")
+
+
+def _json(client, method: str, path: str, body: Optional[dict] = None, headers: Optional[dict] = None):
+    status, content = client.request(method, path, body, headers)
+    if status >= 400 or status == 0:
+        raise SystemExit(f"Setup request {method} {path} failed with status {status}: {content[:200]!r}")
+    return json.loads(content) if content else None
+
+
+def prepare(client, rng: random.Random, limit: int, depths: list, credentials: dict) -> dict:
+    """
+    Untimed setup: log in, sample course ids across the dataset, collect
+    cursors at each depth and create the courses the update scenario edits
+    """
+    token = _json(client, "POST", "/api/auth/login", credentials)["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+    facets = _json(client, "GET", "/api/courses/facets")
+    total = facets["total"]
+    pages = max(1, total // 100)
+
+    ids = []
+    for page in sorted(rng.sample(range(1, pages + 1), min(10, pages))):
+        listing = _json(client, "GET", f"/api/courses?limit=100&page={page}&fields=id&include_total=false")
+        ids.extend(item["id"] for item in listing["items"])
+
+    # Walk the cursor chain once and remember where each depth starts
+    cursors = {}
+    cursor = None
+    for page in range(1, max(depths) + 1):
+        if page in depths:
+            cursors[page] = cursor
+        query = f"/api/courses?limit={limit}&fields=id" + (f"&cursor={urllib.parse.quote(cursor)}" if cursor else "")
+        cursor = _json(client, "GET", query).get("next_cursor")
+        if cursor is None:
+            break
+
+    owned = [
+        _json(client, "POST", "/api/courses", _course_body(rng, "Benchmark update target"), auth)["id"]
+        for _ in range(20)
+    ]
+    return {
+        "credentials": credentials,
+        "auth": auth,
+        "total": total,
+        "ids": ids,
+        "categories": [facet["value"] for facet in facets["category"]],
+        "depths": [depth for depth in depths if depth in cursors and depth <= total // limit],
+        "cursors": cursors,
+        "limit": limit,
+        "owned": owned,
+        "created": list(owned),
+    }
+
+
+def cleanup(client, context: dict) -> None:
+    """Delete every course the suite created"""
+    created = context["created"]
+    for start in range(0, len(created), 500):
+        client.request("POST", "/api/courses/bulk/delete", {"ids": created[start:start + 500]}, context["auth"])
+
+
+def _course_body(rng: random.Random, title: str) -> dict:
+    return {
+        "title": f"{title} {rng.randrange(10 ** 6)}",
+        "description": "Created by the benchmark suite",
+        "category": "Benchmark",
+        "level": rng.choice(LEVELS),
+        "duration": rng.randint(1, 40),
+        "credits": rng.choice([20, 40, 60]),
+        "rating": rng.choice([3.5, 4.0, 4.5, 5.0]),
+    }
+
+
+# Each scenario turns (rng, context) into one request: (method, path, body, headers)
+def list_filters(rng: random.Random, context: dict) -> tuple:
+    params = {"limit": 20, "page": rng.randint(1, 5), "sort_by": rng.choice(SORTS), "order": rng.choice(["asc", "desc"])}
+    if rng.random() < 0.7 and context["categories"]:
+        params["category"] = rng.choice(context["categories"])
+    if rng.random() < 0.5:
+        params["level"] = rng.choice(LEVELS)
+    if rng.random() < 0.3:
+        params["min_rating"] = rng.choice([3.0, 4.0, 4.5])
+    return "GET", "/api/courses?" + urllib.parse.urlencode(params), None, None
+
+
+def deep_offset(rng: random.Random, context: dict) -> tuple:
+    page = rng.choice(context["depths"])
+    return "GET", f"/api/courses?limit={context['limit']}&page={page}&include_total=false", None, None
+
+
+def deep_cursor(rng: random.Random, context: dict) -> tuple:
+    cursor = context["cursors"][rng.choice(context["depths"])]
+    query = f"/api/courses?limit={context['limit']}&include_total=false"
+    return "GET", query + (f"&cursor={urllib.parse.quote(cursor)}" if cursor else ""), None, None
+
+
+def search(rng: random.Random, context: dict) -> tuple:
+    params = {"search": rng.choice(SEARCH_TERMS), "limit": 20, "page": rng.randint(1, 3)}
+    return "GET", "/api/courses?" + urllib.parse.urlencode(params), None, None
+
+
+def get_course(rng: random.Random, context: dict) -> tuple:
+    return "GET", f"/api/courses/{rng.choice(context['ids'])}", None, None
+
+
+def login(rng: random.Random, context: dict) -> tuple:
+    return "POST", "/api/auth/login", context["credentials"], None
+
+
+def create_course(rng: random.Random, context: dict) -> tuple:
+    return "POST", "/api/courses", _course_body(rng, "Benchmark course"), context["auth"]
+
+
+def update_course(rng: random.Random, context: dict) -> tuple:
+    body = {"rating": rng.choice([3.5, 4.0, 4.5, 5.0]), "credits": rng.choice([20, 40, 60])}
+    return "PUT", f"/api/courses/{rng.choice(context['owned'])}", body, context["auth"]
+
+
+# name -> (request factory, expected status, share of --requests to send)
+SCENARIOS: dict[str, tuple[Callable, int, float]] = {
+    "list_filters": (list_filters, 200, 1.0),
+    "deep_offset": (deep_offset, 200, 0.5),
+    "deep_cursor": (deep_cursor, 200, 0.5),
+    "search": (search, 200, 1.0),
+    "get_course": (get_course, 200, 1.0),
+    # Each login costs a full password hash, so fewer of them
+    "login": (login, 200, 0.1),
+    "create_course": (create_course, 201, 0.5),
+    "update_course": (update_course, 200, 0.5),
+}
+
+
+def run_scenario(client, name: str, context: dict, seed: int, requests: int,
+                 concurrency: int, warmup: int) -> dict:
+    factory, expected_status, share = SCENARIOS[name]
+    rng = random.Random(f"{seed}:{name}")
+    count = max(1, int(requests * share))
+    planned = [factory(rng, context) for _ in range(warmup + count)]
+
+    def send(request: tuple) -> tuple[float, int, bytes]:
+        start = time.perf_counter()
+        status, content = client.request(*request)
+        return time.perf_counter() - start, status, content
+
+    warmed = [send(request) for request in planned[:warmup]]
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(send, planned[warmup:]))
+    else:
+        results = [send(request) for request in planned[warmup:]]
+    elapsed = time.perf_counter() - start
+
+    if name == "create_course":
+        context["created"].extend(
+            json.loads(content)["id"] for _, status, content in warmed + results if status == 201
+        )
+    latencies = sorted(latency for latency, _, _ in results)
+    return {
+        "requests": count,
+        "errors": sum(1 for _, status, _ in results if status != expected_status),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(count / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 2),
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2),
+        },
+    }
+
+
+def median_result(runs: list) -> dict:
+    """Per-metric median of repeated runs of one scenario, which damps one-off noise"""
+    if len(runs) == 1:
+        return runs[0]
+
+    def middle(values: list) -> float:
+        return round(statistics.median(values), 2)
+
+    return {
+        "requests": runs[0]["requests"],
+        "errors": max(run["errors"] for run in runs),
+        "elapsed_s": middle([run["elapsed_s"] for run in runs]),
+        "throughput_rps": middle([run["throughput_rps"] for run in runs]),
+        "latency_ms": {key: middle([run["latency_ms"][key] for run in runs]) for key in runs[0]["latency_ms"]},
+        "repeats": len(runs),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metric(result: dict, name: str) -> float:
+    return result["throughput_rps"] if name == "throughput_rps" else result["latency_ms"][name]
+
+
+def compare(baseline: dict, current: dict, max_regression: float) -> list:
+    """Scenario metrics that got worse than the baseline by more than max_regression (a fraction)"""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        if result["errors"] > previous["errors"]:
+            regressions.append({"scenario": name, "metric": "errors",
+                                "baseline": previous["errors"], "current": result["errors"]})
+        for metric in COMPARED_METRICS:
+            old, new = _metric(previous, metric), _metric(result, metric)
+            if not old:
+                continue
+            change = (new - old) / old
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > max_regression:
+                regressions.append({"scenario": name, "metric": metric, "baseline": old,
+                                    "current": new, "change": round(change, 3)})
+    return regressions
+
+
+def print_comparison(baseline: dict, current: dict, regressions: list) -> None:
+    print(f"baseline {baseline['meta'].get('commit')} -> current {current['meta'].get('commit')}", file=sys.stderr)
+    if baseline["meta"].get("cache") != current["meta"].get("cache"):
+        print(f"warning: cache mode differs ({baseline['meta'].get('cache')} -> {current['meta'].get('cache')}), "
+              "the results are not comparable", file=sys.stderr)
+    print(f"{'scenario':<14} {'p50 ms':>16} {'p95 ms':>16} {'rps':>18}", file=sys.stderr)
+    for name, result in current["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        cells = [f"{_metric(previous, metric):>7} -> {_metric(result, metric):<7}" for metric in COMPARED_METRICS]
+        print(f"{name:<14} " + " ".join(cells), file=sys.stderr)
+    for regression in regressions:
+        print(f"REGRESSION {regression['scenario']} {regression['metric']}: "
+              f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of a running API")
+    parser.add_argument("--in-process", action="store_true", help="Call the ASGI app directly instead of --url")
+    parser.add_argument("--serve", action="store_true", help="Start the app with uvicorn on --url's port for the run")
+    parser.add_argument("--with-cache", action="store_true",
+                        help="Keep the response and count caches on (--serve and --in-process only)")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario (scaled by its share)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=1, help="Run each scenario this many times and report medians")
+    parser.add_argument("--depths", nargs="+", type=int, default=[50, 200, 500], help="Pages for the deep scenarios")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--username", default=BENCH_USERNAME)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--baseline", help="Results file to compare against; exit 1 on regressions")
+    parser.add_argument("--max-regression", type=float, default=0.15,
+                        help="Allowed slowdown as a fraction (0.15 = p50/p95 up to 15%% higher, throughput 15%% lower)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Only compare two results files")
+    args = parser.parse_args()
+
+    if args.compare:
+        baseline, current = (json.loads(Path(path).read_text()) for path in args.compare)
+        regressions = compare(baseline, current, args.max_regression)
+        print_comparison(baseline, current, regressions)
+        return 1 if regressions else 0
+
+    server = None
+    cache_mode = "enabled" if args.with_cache else "disabled"
+    if args.in_process:
+        if not args.with_cache:
+            # Before app.main is imported, which reads them
+            os.environ.update(CACHE_DISABLED_ENV)
+        client, concurrency = InProcessClient(), 1
+    else:
+        if args.serve:
+            server = start_server(args.url, args.with_cache)
+        else:
+            cache_mode = "server"
+        client, concurrency = HTTPClient(args.url, args.timeout), args.concurrency
+
+    scenarios = {}
+    try:
+        credentials = {"username": args.username, "password": args.password}
+        context = prepare(client, random.Random(args.seed), args.limit, sorted(set(args.depths)), credentials)
+        try:
+            for name in args.scenarios:
+                if name.startswith("deep_") and not context["depths"]:
+                    print(f"Skipping {name}: the dataset has fewer than {min(args.depths)} pages", file=sys.stderr)
+                    continue
+                scenarios[name] = median_result([
+                    run_scenario(client, name, context, args.seed, args.requests, concurrency, args.warmup)
+                    for _ in range(args.repeat)
+                ])
+                print(f"  {name}: p95 {scenarios[name]['latency_ms']['p95']} ms, "
+                      f"{scenarios[name]['throughput_rps']} req/s", file=sys.stderr)
+        finally:
+            cleanup(client, context)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "target": "in-process" if args.in_process else args.url,
+            # enabled / disabled, or "server" when an external server's settings applied
+            "cache": cache_mode,
+            "courses": context["total"],
+            "concurrency": concurrency,
+            "requests": args.requests,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "scenarios": scenarios,
+    }
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(baseline, results, args.max_regression)
+        print_comparison(baseline, results, regressions)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Course catalog import script - Streams an NDJSON or CSV file of courses into the database
+
+Usage:
+    python import_courses.py catalog.ndjson --user admin
+    python import_courses.py catalog.csv --batch-size 2000
+"""
+import argparse
+import sys
+import time
+from app.database import SessionLocal, engine
+from app.models import Base
+from app import crud, importer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import courses from an NDJSON or CSV file")
+    parser.add_argument("path", help="Path to the .ndjson/.jsonl or .csv file")
+    parser.add_argument("--format", choices=importer.SUPPORTED_FORMATS, help="Input format (detected from the extension if omitted)")
+    parser.add_argument("--user", help="Username to record as the creator of the imported courses")
+    parser.add_argument("--batch-size", type=int, default=crud.BULK_BATCH_SIZE, help="Rows per INSERT batch")
+    args = parser.parse_args()
+
+    fmt = args.format or importer.detect_format(args.path)
+    if fmt is None:
+        print("❌ Could not detect the file format, pass --format ndjson or --format csv")
+        sys.exit(1)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    try:
+        user_id = None
+        if args.user:
+            user = crud.get_user_by_username(db, args.user)
+            if user is None:
+                print(f"❌ User '{args.user}' not found")
+                sys.exit(1)
+            user_id = user.id
+
+        started = time.perf_counter()
+
+        def report_progress(report):
+            rate = report.processed / max(time.perf_counter() - started, 1e-9)
+            print(f"   ... {report.processed} lines, {report.imported} imported, {report.failed} failed ({rate:,.0f} lines/s)")
+
+        print(f"📥 Importing {args.path} ({fmt})...")
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = importer.import_courses(
+                db, stream, fmt,
+                user_id=user_id,
+                batch_size=args.batch_size,
+                on_progress=report_progress
+            )
+
+        print("="*60)
+        print(f"✅ Imported {report.imported} of {report.processed} courses in {time.perf_counter() - started:.1f}s")
+        if report.failed:
+            print(f"⚠️  {report.failed} lines failed:")
+            for error in report.errors:
+                print(f"   line {error.line}: {error.error}")
+            if report.errors_truncated:
+                print("   ... (further errors not shown)")
+        print("="*60)
+
+    except Exception as e:
+        print(f"❌ Error importing courses: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
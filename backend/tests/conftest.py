@@ -0,0 +1,15 @@
+"""
+Test configuration: point the app at a throwaway SQLite database and temporary
+asset/image directories before it is imported
+"""
+import os
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix="course-api-tests-")
+
+# DATABASE_URL from the shell or .env is ignored so it never receives test fixtures;
+# TEST_DATABASE_URL opts in to a dedicated database (e.g. PostgreSQL for the query plan checks)
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{TEST_DIR}/test.db"
+os.environ["ASSET_BUILD_DIR"] = os.path.join(TEST_DIR, "asset-build")
+os.environ["IMAGE_CACHE_DIR"] = os.path.join(TEST_DIR, "image-cache")
+os.environ.setdefault("SECRET_KEY", "test-secret")
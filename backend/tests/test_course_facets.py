@@ -0,0 +1,68 @@
+"""
+The course_facet_counts summary table stays equal to a fresh GROUP BY over courses
+"""
+from collections import Counter
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import crud
+from app.database import SessionLocal
+from app.main import app
+
+COURSE = {"title": "Facets", "description": "A course", "category": "Facets",
+          "level": "Beginner", "duration": 1, "rating": 0.5}
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def auth(client):
+    client.post("/api/auth/register", json={"username": "facets", "email": "facets@example.com", "password": "secret1"})
+    token = client.post("/api/auth/login", json={"username": "facets", "password": "secret1"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def assert_summary_matches():
+    db = SessionLocal()
+    try:
+        crud.facet_summary_cache.clear()
+        summary = Counter({tuple(row[:5]): row[5] for row in crud._facet_summary_rows(db)})
+        expected = Counter()
+        for category, level, published, rating, duration, count in crud._facet_rows(db):
+            expected[(category, level, bool(published), rating, duration)] += count
+        assert summary == expected
+    finally:
+        db.close()
+
+
+def test_single_writes_keep_summary_current(client, auth):
+    course_id = client.post("/api/courses", json=COURSE, headers=auth).json()["id"]
+    assert_summary_matches()
+    client.put(f"/api/courses/{course_id}", json={"rating": 4.5, "level": "Advanced"}, headers=auth)
+    assert_summary_matches()
+    client.delete(f"/api/courses/{course_id}", headers=auth)
+    assert_summary_matches()
+
+
+def test_bulk_writes_keep_summary_current(client, auth):
+    results = client.post("/api/courses/bulk", json=[COURSE, {**COURSE, "duration": 90}], headers=auth).json()["results"]
+    ids = [result["id"] for result in results]
+    assert_summary_matches()
+    # Two updates to the same course in one request move it twice
+    client.put("/api/courses/bulk", json=[
+        {"id": ids[0], "duration": 50, "published": False},
+        {"id": ids[0], "rating": 3.5},
+    ], headers=auth)
+    assert_summary_matches()
+    client.post("/api/courses/bulk/delete", json={"ids": ids}, headers=auth)
+    assert_summary_matches()
+
+
+def test_facets_endpoint_counts_from_summary(client, auth):
+    client.post("/api/courses", json={**COURSE, "category": "Summary only"}, headers=auth)
+    facets = client.get("/api/courses/facets").json()
+    assert {"value": "Summary only", "count": 1} in facets["category"]
@@ -0,0 +1,79 @@
+"""
+SQL statement counts per request, so N+1 loads and extra round trips show up as failures
+"""
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import crud
+from app.database import SessionLocal, engine
+from app.main import app
+from app.models import Course, User
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def course_ids():
+    """Twenty published courses spread across five creators"""
+    db = SessionLocal()
+    try:
+        creators = [
+            User(username=f"creator{index}", email=f"creator{index}@example.com",
+                 full_name=f"Creator {index}", hashed_password="x")
+            for index in range(5)
+        ]
+        db.add_all(creators)
+        db.flush()
+        courses = [
+            Course(title=f"Course {index}", description="A course", category="Computing",
+                   level="Beginner", duration=1.0, credits=30, rating=4.0,
+                   published=True, created_by=creators[index % len(creators)].id)
+            for index in range(20)
+        ]
+        db.add_all(courses)
+        db.commit()
+        return [course.id for course in courses]
+    finally:
+        db.close()
+
+
+@contextmanager
+def count_statements():
+    """Count the statements sent to the database (response and count caches cleared first)"""
+    crud.invalidate_course_caches()
+    statements = []
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_get_course_is_one_statement(client, course_ids):
+    with count_statements() as statements:
+        response = client.get(f"/api/courses/{course_ids[0]}")
+    assert response.status_code == 200
+    assert response.json()["creator"]["username"] == "creator0"
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize("limit", [5, 20])
+def test_expand_creator_statements_do_not_grow_with_page_size(client, course_ids, limit):
+    with count_statements() as statements:
+        response = client.get("/api/courses", params={"expand": "creator", "limit": limit})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == limit
+    assert all(item["creator"] for item in items)
+    # COUNT for the total, the page, and one IN query loading every creator on it
+    assert len(statements) == 3
@@ -0,0 +1,109 @@
+"""
+Query plan regression checks for the hot /api/courses filter + sort combinations
+
+Each combination runs through crud.get_courses; every SELECT it issues is
+EXPLAINed and must not fall back to a full scan of `courses`, i.e. a
+supporting index is missing or no longer usable. Combinations whose sort an
+index is meant to deliver must also not need a sort step (a temp B-tree on
+SQLite, a Sort node on PostgreSQL). On PostgreSQL sequential scans are
+disabled for the check, so the result does not depend on table size or
+statistics. Runs against TEST_DATABASE_URL when set (see conftest.py).
+"""
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app import crud
+from app.database import Base, SessionLocal, engine
+from app.schemas import CourseFilter
+
+# (description, filters, sort_by, order, index_ordered)
+# index_ordered: an index returns the rows in ORDER BY order, so the page needs no sort step
+HOT_COMBINATIONS = [
+    ("category + level, newest", CourseFilter(category="Information Technology", level="Beginner"), "created_at", "desc", False),
+    ("category + published, newest", CourseFilter(category="Information Technology", published=True), "created_at", "desc", False),
+    ("published, newest", CourseFilter(published=True), "created_at", "desc", False),
+    ("published + min_rating", CourseFilter(published=True, min_rating=4.5), "created_at", "desc", False),
+    ("duration range", CourseFilter(min_duration=2, max_duration=6), "created_at", "desc", False),
+    ("credits range", CourseFilter(min_credits=40, max_credits=60), "created_at", "desc", False),
+    ("top rated", None, "rating", "desc", True),
+    ("published, top rated", CourseFilter(published=True), "rating", "desc", True),
+    ("credits ascending", None, "credits", "asc", True),
+]
+
+
+@pytest.fixture(scope="module")
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def capture_statements(run) -> list:
+    """Run a callable and return the (statement, parameters) of the SELECTs it executed"""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def explain(db, statement: str, parameters) -> str:
+    """Return the plan for a captured statement as text"""
+    raw = db.connection().connection.cursor()
+    try:
+        if engine.dialect.name == "postgresql":
+            raw.execute("SET LOCAL enable_seqscan = off")
+            raw.execute("EXPLAIN " + statement, parameters)
+        else:
+            raw.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return "\n".join(str(row[-1]) for row in raw.fetchall())
+    finally:
+        raw.close()
+
+
+def is_full_scan(plan: str) -> bool:
+    if engine.dialect.name == "postgresql":
+        return "Seq Scan on courses" in plan
+    return any(
+        line.strip().startswith("SCAN courses") and "INDEX" not in line
+        for line in plan.splitlines()
+    )
+
+
+def needs_sort(plan: str) -> bool:
+    if engine.dialect.name == "postgresql":
+        return re.search(r"^\s*(->\s*)?(Incremental )?Sort\b", plan, re.MULTILINE) is not None
+    return "USE TEMP B-TREE" in plan
+
+
+@pytest.mark.parametrize(
+    "filters, sort_by, order, index_ordered",
+    [combination[1:] for combination in HOT_COMBINATIONS],
+    ids=[combination[0] for combination in HOT_COMBINATIONS],
+)
+def test_hot_combination_uses_index(db, filters, sort_by, order, index_ordered):
+    crud.course_count_cache.clear()
+    statements = capture_statements(
+        lambda: crud.get_courses(db, limit=20, filters=filters, sort_by=sort_by, order=order)
+    )
+    assert statements
+    try:
+        for statement, parameters in statements:
+            plan = explain(db, statement, parameters)
+            assert not is_full_scan(plan), f"full table scan:\n{plan}"
+            if index_ordered and "ORDER BY" in statement:
+                assert not needs_sort(plan), f"sort step:\n{plan}"
+    finally:
+        db.rollback()
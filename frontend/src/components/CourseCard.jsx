@@ -1,5 +1,8 @@
 import React from 'react';
 
+// Derivative widths served by the API's /images endpoint (IMAGE_WIDTHS)
+const IMAGE_WIDTHS = [160, 320, 480, 640, 960];
+
 const CourseCard = ({ course }) => {
   const {
     id,
@@ -15,15 +18,27 @@ const CourseCard = ({ course }) => {
   // API Base URL
   const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
 
+  // Let the browser pick a resized copy instead of downloading the full-size asset.
+  // image_url is the content-hashed asset URL, so the derivatives are hashed (immutable) too.
+  const srcSet = image_url && image_url.startsWith('/assets/')
+    ? IMAGE_WIDTHS
+        .map((width) => `${API_BASE_URL}/images/${width}/${image_url.slice('/assets/'.length)} ${width}w`)
+        .join(', ')
+    : undefined;
+
   return (
     <div className="course-card-figma">
       {/* Course Image */}
       <div className="course-card-image-wrapper">
         <img 
           src={`${API_BASE_URL}${image_url}`}
+          srcSet={srcSet}
+          sizes="(max-width: 600px) 100vw, 380px"
+          loading="lazy"
           alt={title}
           className="course-card-image"
           onError={(e) => {
+            e.target.srcset = '';
             e.target.src = 'https://via.placeholder.com/380x220/F7F0E8/2B180A?text=Course+Image';
           }}
         />
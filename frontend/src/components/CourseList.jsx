@@ -3,6 +3,9 @@ import CourseCard from './CourseCard';
 import CategoryTabs from '../components/CatergoryTabs';
 import { getCourses } from '../services/api';
 
+// Only the fields CourseCard renders
+const CARD_FIELDS = 'id,title,category,level,credits,rating,duration_text,image_url';
+
 const CourseList = () => {
   const [courses, setCourses] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -25,7 +28,7 @@ const CourseList = () => {
   const fetchCourses = async () => {
     try {
       setLoading(true);
-      const response = await getCourses(filters);
+      const response = await getCourses({ ...filters, fields: CARD_FIELDS });
       setCourses(response.items || []);
       setTotalPages(response.total_pages || 1);
       setCurrentPage(response.page || 1);
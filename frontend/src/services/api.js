@@ -55,6 +55,21 @@ export const getCourseById = async (courseId) => {
   }
 };
 
+/**
+ * Get many courses by ID in one request
+ * @param {string[]} courseIds - Course IDs
+ * @returns {Object} { items: courses in request order, missing: unknown IDs }
+ */
+export const getCoursesByIds = async (courseIds) => {
+  try {
+    const response = await api.post('/api/courses/batch', { ids: courseIds });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching courses:', error);
+    throw error;
+  }
+};
+
 /**
  * Create new course (requires authentication)
  * @param {Object} courseData - Course data